@@ -0,0 +1,41 @@
+import argparse
+import sys
+
+from src.benchmark import BenchmarkSuite
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks of the simulation, controller, fitness and sweep hot paths')
+    parser.add_argument('names', nargs='*', help='Only run these benchmarks')
+    parser.add_argument('--repeats', type=int, default=9)
+    parser.add_argument('--save', help='Store the results as JSON baseline')
+    parser.add_argument('--baseline', help='Compare the results against a JSON baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Relative slowdown which still counts as no regression')
+    parser.add_argument('--min-delta', type=float, default=50.0, help='Microseconds of slowdown which still count as no regression')
+    parser.add_argument('--import-budget', type=float, help='Milliseconds the import of every package may take, fails as well if a package imports pygame, pandas, scipy, matplotlib or plotly')
+    args = parser.parse_args()
+
+    suite = BenchmarkSuite(repeats=args.repeats)
+    results = suite.run(args.names, verbose=True)
+    if args.save:
+        BenchmarkSuite.save(results, args.save)
+
+    failed = False
+    if args.baseline:
+        regressions = BenchmarkSuite.compare(results, BenchmarkSuite.load(args.baseline), args.tolerance, args.min_delta / 1e6)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        failed = bool(regressions)
+
+    if args.import_budget is not None:
+        violations = BenchmarkSuite.check_import_budget(args.import_budget / 1e3, repeats=args.repeats)
+        for violation in violations:
+            print(f'IMPORT BUDGET {violation}')
+        failed = failed or bool(violations)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
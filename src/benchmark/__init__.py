@@ -0,0 +1,2 @@
+from .benchmarkresult import BenchmarkResult
+from .benchmarksuite import BenchmarkSuite
@@ -0,0 +1,22 @@
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Timing of one benchmark. seconds is the median of all repeats and spread their median absolute deviation, rate the
+    number of operations (unit) per second derived from the median. stages holds the median seconds per call of the
+    individual stages, if the benchmark has any, and stage_spreads their median absolute deviations. calibration is the
+    median seconds of BenchmarkSuite.calibration measured right before the benchmark, 0 if unknown.
+    """
+    name: str
+    unit: str
+    operations: int
+    seconds: float
+    rate: float
+    peak_memory: int
+    stages: Dict[str, float] = field(default_factory=dict)
+    spread: float = 0.0
+    stage_spreads: Dict[str, float] = field(default_factory=dict)
+    calibration: float = 0.0
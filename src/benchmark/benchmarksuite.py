@@ -0,0 +1,378 @@
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+from typing import Callable, Dict, List, Tuple, Sequence
+
+import numpy as np
+
+from src.genetic import fitness, fitness_batch
+from src.genetic.fitness import (
+    prepare_data,
+    prepare_batch_data,
+    get_setpoint_changing_points,
+    get_differentiated_positions,
+    get_intersection_points,
+    get_intersection_mask,
+    get_approaching_areas,
+    get_approaching_area_ends,
+    calculate_fitness,
+    calculate_fitness_batch
+)
+from src.simulation import Simulation, Scenario
+from src.pid import PIDController
+from src.bruteforce import BruteForcePlatform, GainGrid, SweepRunner
+from src.bruteforce.bruteforceagent import BruteForceAgent
+from src.benchmark.benchmarkresult import BenchmarkResult
+
+
+class BenchmarkSuite:
+    """
+    Repeatable benchmarks of the hot paths on the fixed scenario of the notebooks. Every benchmark is timed repeats
+    times after a warm-up run and reports the median run and the median absolute deviation as spread, the peak memory
+    gets measured in an extra run with tracemalloc, which would distort the timings otherwise.
+
+    The results can be saved as JSON baseline and later runs compared against it.
+
+    The import benchmark measures the import of the headless core in fresh interpreters, check_import_budget
+    additionally makes sure that no package of IMPORT_MODULES pulls in one of the HEAVY_MODULES at import time.
+    """
+    MASS = 0.2
+    FPS = 30
+    WEIGHT_FACTOR = 0.4
+    GAINS = (-10.3617, -0.1086, -250.848)
+    SCENARIO = Scenario.from_profiles([(10, -10), (10, 5), (40, 0), (10, 8), (10, 0)], [(30, 0), (50, 1)], fps=30)
+    # Multiple of the spreads a slowdown has to exceed to count as regression
+    NOISE_FACTOR = 3.0
+    CORE_MODULES = ('src.simulation', 'src.pid', 'src.genetic', 'src.bruteforce')
+    # Packages which have to stay importable without any of the HEAVY_MODULES
+    IMPORT_MODULES = CORE_MODULES + ('src.evaluation', 'src.telemetry', 'src.instrumentation', 'src.optimization', 'src.visualization')
+    HEAVY_MODULES = ('pygame', 'pandas', 'scipy', 'matplotlib', 'plotly')
+    ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    def __init__(self, repeats: int = 9, batch_size: int = 256, grid_shape: Tuple[int, int, int] = (12, 8, 12), num_workers: int = 2, seed: int = 0):
+        """
+        :param batch_size: Number of controllers of the batched benchmarks
+        :param grid_shape: Number of kp, ki and kd values of the sweep benchmark
+        """
+        self.repeats = repeats
+        self.batch_size = batch_size
+        self.grid_shape = grid_shape
+        self.num_workers = num_workers
+        self.delta_t = 1 / self.FPS
+        self.setpoints = self.SCENARIO.setpoints.tolist()
+        self.external_force = self.SCENARIO.external_force.tolist()
+        self.batch_gains = np.random.default_rng(seed).uniform([-20, -0.2, -500], [0, 0, 0], (batch_size, 3))
+
+    def benchmarks(self) -> Dict[str, Callable[[], BenchmarkResult]]:
+        return {
+            'simulation.next': self.simulation_next,
+            'pid.next': self.pid_next,
+            'fitness': self.fitness,
+            'fitness_batch': self.fitness_batch,
+            'agent.run': self.agent_run,
+            'platform.execute_batch': self.platform_execute_batch,
+            'sweep': self.sweep,
+            'import': self.import_core
+        }
+
+    def run(self, names: List[str] | None = None, verbose: bool = False) -> Dict[str, BenchmarkResult]:
+        results = {}
+        for name, benchmark in self.benchmarks().items():
+            if names and name not in names:
+                continue
+            results[name] = benchmark()
+            if verbose:
+                print(self.format(results[name]))
+
+        return results
+
+    def measure(self, name: str, unit: str, operations: int, fun: Callable[[], object], stages: Dict[str, Callable[[], object]] | None = None) -> BenchmarkResult:
+        calibration_seconds, _ = self.time(self.calibration)
+        seconds, spread = self.time(fun)
+        stage_timings = {stage: self.time(stage_fun) for stage, stage_fun in (stages or {}).items()}
+
+        tracemalloc.start()
+        try:
+            fun()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return BenchmarkResult(
+            name,
+            unit,
+            operations,
+            seconds,
+            operations / seconds,
+            peak_memory,
+            {stage: stage_seconds for stage, (stage_seconds, _) in stage_timings.items()},
+            spread,
+            {stage: stage_spread for stage, (_, stage_spread) in stage_timings.items()},
+            calibration_seconds
+        )
+
+    def time(self, fun: Callable[[], object]) -> Tuple[float, float]:
+        """
+        :return: Median seconds of the repeats after a warm-up run and their median absolute deviation
+        """
+        fun()
+        timings = []
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            fun()
+            timings.append(time.perf_counter() - start)
+
+        return self.median_spread(timings)
+
+    @staticmethod
+    def median_spread(timings: Sequence[float]) -> Tuple[float, float]:
+        median = float(np.median(timings))
+
+        return median, float(np.median(np.abs(np.asarray(timings) - median)))
+
+    @staticmethod
+    def calibration():
+        """
+        Fixed mix of interpreted Python, small NumPy operations and operations on a (256, 2400) Matrix like in the hot
+        paths, which doesn't depend on any code of the repository. Its timing measures how fast the machine is right now.
+        """
+        values = np.linspace(-1, 1, 2400)
+        total = 0.0
+        for value in values.tolist():
+            total = 0.5 * total + value * value
+        for _ in range(50):
+            np.cumsum(np.abs(np.diff(values)))
+        matrix = np.tile(values, (256, 1))
+        for _ in range(3):
+            total += float(np.sum(np.cumsum(np.abs(np.diff(matrix, axis=1)), axis=1) > 1))
+
+        return total
+
+    def simulation_next(self) -> BenchmarkResult:
+        angles = np.random.default_rng(0).uniform(-10, 10, len(self.setpoints)).tolist()
+
+        def run():
+            simulation = Simulation(self.MASS, self.delta_t)
+            for angle, external_force in zip(angles, self.external_force):
+                simulation.next(angle, external_force)
+
+        return self.measure('simulation.next', 'steps', len(angles), run)
+
+    def pid_next(self) -> BenchmarkResult:
+        positions = np.random.default_rng(0).uniform(-10, 10, len(self.setpoints)).tolist()
+
+        def run():
+            pid_controller = PIDController(*self.GAINS, self.setpoints[0])
+            for position in positions:
+                pid_controller.next(position)
+
+        return self.measure('pid.next', 'steps', len(positions), run)
+
+    def fitness(self) -> BenchmarkResult:
+        positions = self.simulate()
+        prepared_positions, prepared_setpoints = prepare_data(positions, self.setpoints)
+        setpoint_changes = get_setpoint_changing_points(prepared_setpoints)
+        _, positions_abs_diff = get_differentiated_positions(prepared_positions)
+        intersection_points = get_intersection_points(prepared_positions, prepared_setpoints, positions_abs_diff, threshold=0.02)
+        approaching_areas = get_approaching_areas(prepared_setpoints, setpoint_changes, intersection_points)
+        stages = {
+            'prepare_data': lambda: prepare_data(positions, self.setpoints),
+            'get_setpoint_changing_points': lambda: get_setpoint_changing_points(prepared_setpoints),
+            'get_differentiated_positions': lambda: get_differentiated_positions(prepared_positions),
+            'get_intersection_points': lambda: get_intersection_points(prepared_positions, prepared_setpoints, positions_abs_diff, threshold=0.02),
+            'get_approaching_areas': lambda: get_approaching_areas(prepared_setpoints, setpoint_changes, intersection_points),
+            'calculate_fitness': lambda: calculate_fitness(prepared_positions, prepared_setpoints, approaching_areas, self.WEIGHT_FACTOR)
+        }
+
+        return self.measure('fitness', 'evaluations', 1, lambda: fitness(positions, self.setpoints, self.WEIGHT_FACTOR), stages)
+
+    def fitness_batch(self) -> BenchmarkResult:
+        _, _, _, _, positions = BruteForcePlatform.execute_batch(self.batch_gains, self.MASS, self.delta_t, self.setpoints, self.external_force, weight_factor=self.WEIGHT_FACTOR)
+        prepared_positions, prepared_setpoints = prepare_batch_data(positions, self.setpoints)
+        setpoint_changes = get_setpoint_changing_points(prepared_setpoints)
+        _, positions_abs_diff = get_differentiated_positions(prepared_positions)
+        intersection_mask = get_intersection_mask(prepared_positions, prepared_setpoints, positions_abs_diff, threshold=0.02)
+        approaching_area_ends = get_approaching_area_ends(prepared_setpoints, setpoint_changes, intersection_mask)
+        stages = {
+            'prepare_batch_data': lambda: prepare_batch_data(positions, self.setpoints),
+            'get_differentiated_positions': lambda: get_differentiated_positions(prepared_positions),
+            'get_intersection_mask': lambda: get_intersection_mask(prepared_positions, prepared_setpoints, positions_abs_diff, threshold=0.02),
+            'get_approaching_area_ends': lambda: get_approaching_area_ends(prepared_setpoints, setpoint_changes, intersection_mask),
+            'calculate_fitness_batch': lambda: calculate_fitness_batch(prepared_positions, prepared_setpoints, setpoint_changes, approaching_area_ends, self.WEIGHT_FACTOR)
+        }
+
+        return self.measure('fitness_batch', 'evaluations', len(positions), lambda: fitness_batch(positions, self.setpoints, self.WEIGHT_FACTOR), stages)
+
+    def agent_run(self) -> BenchmarkResult:
+        def run():
+            agent = BruteForceAgent(Simulation(self.MASS, self.delta_t), PIDController(*self.GAINS, self.setpoints[0]), fitness)
+            agent.run(self.setpoints, self.external_force, self.WEIGHT_FACTOR)
+
+        return self.measure('agent.run', 'evaluations', 1, run)
+
+    def platform_execute_batch(self) -> BenchmarkResult:
+        def run():
+            BruteForcePlatform.execute_batch(self.batch_gains, self.MASS, self.delta_t, self.setpoints, self.external_force, weight_factor=self.WEIGHT_FACTOR)
+
+        return self.measure('platform.execute_batch', 'evaluations', len(self.batch_gains), run)
+
+    def sweep(self) -> BenchmarkResult:
+        num_p, num_i, num_d = self.grid_shape
+        grid = GainGrid(np.linspace(-20, 0, num_p), np.linspace(-0.2, 0, num_i), np.linspace(-500, 0, num_d))
+        runner = SweepRunner(grid, self.MASS, self.delta_t, self.setpoints, self.external_force, self.WEIGHT_FACTOR, num_workers=self.num_workers, chunk_size=128)
+
+        return self.measure('sweep', 'evaluations', len(grid), runner.run)
+
+    def import_core(self) -> BenchmarkResult:
+        calibration_seconds, _ = self.time(self.calibration)
+        seconds, spread, _ = self.import_time(self.CORE_MODULES, self.repeats)
+        stage_timings = {module: self.import_time([module], self.repeats)[:2] for module in self.CORE_MODULES}
+
+        return BenchmarkResult(
+            'import',
+            'imports',
+            1,
+            seconds,
+            1 / seconds,
+            0,
+            {module: module_seconds for module, (module_seconds, _) in stage_timings.items()},
+            spread,
+            {module: module_spread for module, (_, module_spread) in stage_timings.items()},
+            calibration_seconds
+        )
+
+    def simulate(self) -> List[float]:
+        agent = BruteForceAgent(Simulation(self.MASS, self.delta_t), PIDController(*self.GAINS, self.setpoints[0]), fitness)
+        _, positions = agent.run(self.setpoints, self.external_force, self.WEIGHT_FACTOR)
+
+        return positions
+
+    @staticmethod
+    def import_time(modules: Sequence[str], repeats: int = 5) -> Tuple[float, float, List[str]]:
+        """
+        Imports the modules in fresh interpreters, the start of the interpreter itself doesn't count
+        :return: Median import time in seconds, its median absolute deviation and the HEAVY_MODULES which got imported
+        along
+        """
+        code = (
+            'import json, sys, time\n'
+            'start = time.perf_counter()\n'
+            f'import {", ".join(modules)}\n'
+            'print(json.dumps([time.perf_counter() - start, list(sys.modules)]))'
+        )
+        timings = []
+        heavy_modules = []
+        for _ in range(repeats):
+            output = subprocess.run([sys.executable, '-c', code], cwd=BenchmarkSuite.ROOT_DIRECTORY, capture_output=True, text=True, check=True).stdout
+            seconds, loaded_modules = json.loads(output.splitlines()[-1])
+            timings.append(seconds)
+            heavy_modules = [module for module in BenchmarkSuite.HEAVY_MODULES if module in loaded_modules]
+
+        return (*BenchmarkSuite.median_spread(timings), heavy_modules)
+
+    @staticmethod
+    def check_import_budget(budget: float, modules: Sequence[str] = IMPORT_MODULES, repeats: int = 5) -> List[str]:
+        """
+        :param budget: Seconds the import of every single module may take
+        :return: Description of every module which exceeds the budget or imports a heavy dependency, empty if there is
+        none
+        """
+        violations = []
+        for module in modules:
+            seconds, _, heavy_modules = BenchmarkSuite.import_time([module], repeats)
+            if seconds > budget:
+                violations.append(f'{module}: import takes {seconds * 1e3:.1f} ms, budget {budget * 1e3:.1f} ms')
+            if heavy_modules:
+                violations.append(f'{module}: imports {", ".join(heavy_modules)}')
+
+        return violations
+
+    @staticmethod
+    def format(result: BenchmarkResult) -> str:
+        line = f'{result.name:<24} {result.rate:>14,.0f} {result.unit}/s   {result.seconds * 1e3:>10.3f} ms   peak {result.peak_memory / 2 ** 20:>8.2f} MiB'
+        for stage, seconds in result.stages.items():
+            line += f'\n    {stage:<32} {seconds * 1e6:>10.1f} us'
+
+        return line
+
+    @staticmethod
+    def save(results: Dict[str, BenchmarkResult], path: str):
+        baseline = {
+            'environment': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'machine': platform.machine(),
+                'processor': platform.processor(),
+                'cpu_count': multiprocessing.cpu_count()
+            },
+            'results': {name: asdict(result) for name, result in results.items()}
+        }
+        with open(path, 'w') as file:
+            json.dump(baseline, file, indent=2)
+
+    @staticmethod
+    def load(path: str) -> Dict[str, BenchmarkResult]:
+        with open(path) as file:
+            baseline = json.load(file)
+
+        return {name: BenchmarkResult(**result) for name, result in baseline['results'].items()}
+
+    @staticmethod
+    def compare(results: Dict[str, BenchmarkResult], baseline: Dict[str, BenchmarkResult], tolerance: float = 0.25, min_delta: float = 50e-6) -> List[str]:
+        """
+        A slowdown only counts as regression if it exceeds the tolerance, min_delta and NOISE_FACTOR times the spreads of
+        both timings, so stages of a few microseconds and noisy timings don't produce false alarms. The baseline timings
+        get scaled by how much slower or faster the calibration ran right before the benchmark than in the baseline run,
+        which cancels out other load or CPU frequency scaling
+        :param tolerance: Relative slowdown or memory growth which is still accepted
+        :param min_delta: Absolute slowdown in seconds which is still accepted
+        :return: Description of every regression, empty if there is none
+        """
+        regressions = []
+        for name, result in results.items():
+            if name not in baseline:
+                continue
+            reference = baseline[name]
+            if result.calibration > 0 and reference.calibration > 0:
+                reference = BenchmarkSuite.scale(reference, result.calibration / reference.calibration)
+            if result.rate < reference.rate * (1 - tolerance) and BenchmarkSuite.is_significant(result.seconds - reference.seconds, result.spread, reference.spread, min_delta):
+                regressions.append(f'{name}: {result.rate:,.0f} {result.unit}/s, baseline {reference.rate:,.0f} {reference.unit}/s ({result.rate / reference.rate - 1:+.0%})')
+            if result.peak_memory > reference.peak_memory * (1 + tolerance):
+                regressions.append(f'{name}: peak memory {result.peak_memory:,} B, baseline {reference.peak_memory:,} B ({result.peak_memory / reference.peak_memory - 1:+.0%})')
+            for stage, seconds in result.stages.items():
+                if stage not in reference.stages:
+                    continue
+                reference_seconds = reference.stages[stage]
+                delta = seconds - reference_seconds
+                if seconds > reference_seconds * (1 + tolerance) and BenchmarkSuite.is_significant(delta, result.stage_spreads.get(stage, 0.0), reference.stage_spreads.get(stage, 0.0), min_delta):
+                    regressions.append(f'{name}.{stage}: {seconds * 1e6:.1f} us, baseline {reference_seconds * 1e6:.1f} us ({seconds / reference_seconds - 1:+.0%})')
+
+        return regressions
+
+    @staticmethod
+    def scale(result: BenchmarkResult, speed_factor: float) -> BenchmarkResult:
+        """
+        :param speed_factor: Factor the timings of the result get multiplied with
+        """
+        return BenchmarkResult(
+            result.name,
+            result.unit,
+            result.operations,
+            result.seconds * speed_factor,
+            result.rate / speed_factor,
+            result.peak_memory,
+            {stage: seconds * speed_factor for stage, seconds in result.stages.items()},
+            result.spread * speed_factor,
+            {stage: spread * speed_factor for stage, spread in result.stage_spreads.items()},
+            result.calibration * speed_factor
+        )
+
+    @staticmethod
+    def is_significant(delta: float, spread: float, reference_spread: float, min_delta: float) -> bool:
+        return delta > max(min_delta, BenchmarkSuite.NOISE_FACTOR * (spread + reference_spread))
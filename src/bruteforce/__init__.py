@@ -1 +1,13 @@
 from .bruteforceplatform import BruteForcePlatform
+from .sharedbound import SharedBound
+from .stabilityscreen import StabilityScreen
+from .gaingrid import GainGrid
+from .reducer import Reducer
+from .errorarrayreducer import ErrorArrayReducer
+from .topkreducer import TopKReducer
+from .quantilesketchreducer import QuantileSketchReducer
+from .sweeprunner import SweepRunner
+from .resultstore import ResultStore
+from .adaptivegridsearch import AdaptiveGridSearch
+from .sweepworker import SweepWorker
+from .sweepcoordinator import SweepCoordinator
@@ -0,0 +1,119 @@
+from itertools import product
+from typing import List, Tuple, Dict
+
+import numpy as np
+
+from src.bruteforce.bruteforceplatform import BruteForcePlatform
+from src.bruteforce.stabilityscreen import StabilityScreen
+from src.genetic.fitness import rank_errors
+
+
+class AdaptiveGridSearch:
+    """
+    Coarse-to-fine alternative to the uniform brute force grid. A coarse grid gets evaluated first, then only the most
+    promising cells get subdivided, level by level, until the target resolution is reached.
+
+    All points lie on one integer lattice of the finest level, so a corner which is shared by several cells or which
+    was already evaluated on a coarser level is looked up instead of simulated again.
+    """
+    def __init__(
+            self,
+            bounds: Tuple[Tuple[float, float], Tuple[float, float], Tuple[float, float]],
+            mass: float,
+            delta_t: float,
+            setpoints: List[float],
+            external_force: List[float],
+            weight_factor: float,
+            num_coarse_points: int = 9,
+            num_cells: int = 8,
+            num_levels: int = 4,
+            stability_tolerance: float | None = None):
+        """
+        :param bounds: (min, max) of kp, ki and kd
+        :param num_coarse_points: Number of points per axis of the coarse grid
+        :param num_cells: Number of cells which get subdivided on every level
+        :param num_levels: Number of subdivisions, every level halves the spacing of the grid
+        :param stability_tolerance: If set, candidates which fail the StabilityScreen get an error of inf without
+        being simulated
+        """
+        assert num_coarse_points >= 2
+        self.bounds = np.asarray(bounds, dtype=float)
+        self.mass = mass
+        self.delta_t = delta_t
+        self.setpoints = setpoints
+        self.external_force = external_force
+        self.weight_factor = weight_factor
+        self.num_coarse_points = num_coarse_points
+        self.num_cells = num_cells
+        self.num_levels = num_levels
+        self.stability_tolerance = stability_tolerance
+
+        self.num_lattice_steps = (num_coarse_points - 1) * 2 ** num_levels
+        self.errors: Dict[Tuple[int, int, int], float] = {}
+        self.num_simulations = 0
+
+    @property
+    def resolution(self) -> np.ndarray:
+        """
+        :return: Spacing of the finest grid for kp, ki and kd
+        """
+        return (self.bounds[:, 1] - self.bounds[:, 0]) / self.num_lattice_steps
+
+    def to_gains(self, lattice_points: np.ndarray) -> np.ndarray:
+        return self.bounds[:, 0] + np.asarray(lattice_points) * self.resolution
+
+    def evaluate(self, lattice_points: List[Tuple[int, int, int]]):
+        new_points = [point for point in dict.fromkeys(lattice_points) if point not in self.errors]
+        if not new_points:
+            return
+        gains = self.to_gains(new_points)
+        errors = np.full(len(gains), np.inf)
+
+        is_candidate = np.ones(len(gains), dtype=bool)
+        if self.stability_tolerance is not None:
+            is_candidate = StabilityScreen.mask(gains, self.mass, self.delta_t, self.stability_tolerance)
+        if np.any(is_candidate):
+            _, _, _, errors[is_candidate], _ = BruteForcePlatform.execute_batch(
+                gains[is_candidate],
+                self.mass,
+                self.delta_t,
+                self.setpoints,
+                self.external_force,
+                weight_factor=self.weight_factor
+            )
+            self.num_simulations += int(np.sum(is_candidate))
+
+        self.errors.update(zip(new_points, rank_errors(errors).tolist()))
+
+    @staticmethod
+    def cell_points(cell: Tuple[int, int, int], size: int, num_divisions: int) -> List[Tuple[int, int, int]]:
+        offsets = range(0, size + 1, size // num_divisions)
+
+        return [(cell[0] + a, cell[1] + b, cell[2] + c) for a, b, c in product(offsets, repeat=3)]
+
+    def score(self, cell: Tuple[int, int, int], size: int) -> float:
+        return min(self.errors[point] for point in self.cell_points(cell, size, 1))
+
+    def run(self) -> Tuple[np.ndarray, float]:
+        """
+        Runs the search
+        :return: Best (kp, ki, kd) combination, Error
+        """
+        # Evaluate the coarse grid, each of its cells spans 2^num_levels steps of the finest lattice
+        size = 2 ** self.num_levels
+        coarse_offsets = range(0, self.num_lattice_steps, size)
+        cells = list(product(coarse_offsets, repeat=3))
+        self.evaluate([point for cell in cells for point in self.cell_points(cell, size, 1)])
+
+        for _ in range(self.num_levels):
+            # Keep the most promising cells and split every one of them into eight cells of half the size
+            best_cells = sorted(cells, key=lambda cell: self.score(cell, size))[:self.num_cells]
+            self.evaluate([point for cell in best_cells for point in self.cell_points(cell, size, 2)])
+            size //= 2
+            cells = list(dict.fromkeys(
+                (cell[0] + a, cell[1] + b, cell[2] + c) for cell in best_cells for a, b, c in product((0, size), repeat=3)
+            ))
+
+        best_point = min(self.errors, key=self.errors.get)
+
+        return self.to_gains(best_point), self.errors[best_point]
@@ -0,0 +1,79 @@
+from typing import List, Callable, Tuple
+
+import numpy as np
+
+from src.simulation import BatchSimulation, Scenario
+from src.pid import BatchPIDController
+from src.genetic import BatchFitnessAccumulator
+from src.bruteforce.sharedbound import SharedBound
+
+
+class BatchBruteForceAgent:
+    def __init__(self, simulation: BatchSimulation, pid_controller: BatchPIDController, error_fun: Callable):
+        self.simulation = simulation
+        self.pid_controller = pid_controller
+        self.error_fun = error_fun
+
+    def simulate(self, setpoints: List[float] | np.ndarray | Scenario, external_force: List[float] | np.ndarray | None) -> np.ndarray:
+        """
+        Steps all PID-Controllers of the batch in lockstep through the scenario
+        :param setpoints: The desired Positions for the balls, either shared of shape (T,) or one row per ball (N, T),
+        or a Scenario which also provides the external force
+        :param external_force: The Wind pushing against the balls, either shared of shape (T,) or one row per ball (N, T)
+        :return: Positions of the balls as (N, T) Matrix
+        """
+        if isinstance(setpoints, Scenario):
+            setpoints, external_force = setpoints.setpoints, setpoints.external_force
+        setpoints = np.asarray(setpoints, dtype=float)
+        external_force = np.asarray(external_force, dtype=float)
+        positions = np.empty((self.simulation.size, setpoints.shape[-1]))
+        position = self.simulation.position_x
+        for idx, setpoint in enumerate(setpoints.T):
+            self.pid_controller.setpoint = setpoint
+            new_angle = self.pid_controller.next(position)
+            _, _, position = self.simulation.next(new_angle, external_force.T[idx])
+            positions[:, idx] = position
+
+        return positions
+
+    def simulate_bounded(self, setpoints: List[float] | Scenario, external_force: List[float] | None, weight_factor: float, bound: SharedBound, check_interval: int = 30) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Steps the batch through the scenario like simulate, but stops as soon as no entry can beat the bound anymore
+        :return: Mask of the entries which got aborted, Positions of the balls as (N, T) Matrix (NaN after an abort)
+        """
+        if isinstance(setpoints, Scenario):
+            setpoints, external_force = setpoints.setpoints, setpoints.external_force
+
+        accumulator = BatchFitnessAccumulator(self.simulation.size, weight_factor)
+        is_aborted = np.zeros(self.simulation.size, dtype=bool)
+        positions = np.full((self.simulation.size, len(setpoints)), np.nan)
+        position = self.simulation.position_x
+        for idx, setpoint in enumerate(setpoints):
+            self.pid_controller.setpoint = setpoint
+            new_angle = self.pid_controller.next(position)
+            _, _, position = self.simulation.next(new_angle, external_force[idx])
+            positions[~is_aborted, idx] = position[~is_aborted]
+
+            # Abort hopeless entries, the accumulated errors only grow from here on
+            accumulator.add(position, setpoint)
+            if idx % check_interval == 0:
+                is_aborted |= bound.exceeds(accumulator.value)
+                if np.all(is_aborted):
+                    break
+
+        return is_aborted, positions
+
+    def run(self, setpoints: List[float] | Scenario, external_force: List[float] | None, weight_factor: float, bound: SharedBound | None = None, check_interval: int = 30) -> Tuple[np.ndarray, np.ndarray]:
+        if bound is None:
+            positions = self.simulate(setpoints, external_force)
+            errors = self.error_fun(positions, setpoints, weight_factor=weight_factor)
+
+            return errors, positions
+
+        is_aborted, positions = self.simulate_bounded(setpoints, external_force, weight_factor, bound, check_interval)
+        errors = np.full(self.simulation.size, np.inf)
+        if not np.all(is_aborted):
+            errors[~is_aborted] = self.error_fun(positions[~is_aborted], setpoints, weight_factor=weight_factor)
+            bound.update(errors[~is_aborted])
+
+        return errors, positions
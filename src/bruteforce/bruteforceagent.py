@@ -1,7 +1,10 @@
+from math import inf
 from typing import List, Callable
 
-from src.simulation import Simulation
+from src.simulation import Simulation, Scenario
 from src.pid import PIDController
+from src.genetic import FitnessAccumulator
+from src.bruteforce.sharedbound import SharedBound
 
 
 class BruteForceAgent:
@@ -10,7 +13,19 @@ class BruteForceAgent:
         self.pid_controller = pid_controller
         self.error_fun = error_fun
 
-    def run(self, setpoints: List[float], external_force: List[float], weight_factor: float):
+    def run(self, setpoints: List[float] | Scenario, external_force: List[float] | None, weight_factor: float, bound: SharedBound | None = None, check_interval: int = 30):
+        """
+        Simulates the scenario and calculates the error of the PID-Controller
+        :param setpoints: The desired Positions for the ball, or a Scenario which also provides the external force
+        :param bound: Optional best-so-far bound, the run gets aborted with an error of inf as soon as it can't beat it
+        :param check_interval: Number of steps between two checks against the bound
+        :return: Error, Positions
+        """
+        scenario = setpoints
+        if isinstance(setpoints, Scenario):
+            setpoints, external_force = setpoints.setpoints.tolist(), setpoints.external_force.tolist()
+
+        accumulator = FitnessAccumulator(weight_factor) if bound is not None else None
         positions = []
         position = 0
         for idx, _ in enumerate(setpoints):
@@ -19,6 +34,14 @@ class BruteForceAgent:
             _, _, position = self.simulation.next(new_angle, external_force[idx])
             positions.append(position)
 
-        error = self.error_fun(positions, setpoints, weight_factor=weight_factor)
+            # Abort hopeless runs, the accumulated error only grows from here on
+            if accumulator is not None:
+                accumulator.add(position, setpoints[idx])
+                if idx % check_interval == 0 and bound.exceeds(accumulator.value):
+                    return inf, positions
+
+        error = self.error_fun(positions, scenario, weight_factor=weight_factor)
+        if bound is not None:
+            bound.update(error)
 
         return error, positions
@@ -1,17 +1,49 @@
 from typing import List, Tuple, Callable
 
-from src.simulation import Simulation
-from src.pid import PIDController
+import numpy as np
+
+from src.genetic import fitness_batch
+from src.simulation import Simulation, BatchSimulation, Scenario
+from src.pid import PIDController, BatchPIDController
 from src.bruteforce.bruteforceagent import BruteForceAgent
+from src.bruteforce.batchbruteforceagent import BatchBruteForceAgent
+from src.bruteforce.sharedbound import SharedBound
 
 
 class BruteForcePlatform:
     @staticmethod
-    def execute(pid_args: Tuple[float, float, float], mass: float, delta_t, setpoints: List[float], external_force: List[float], error_fun: Callable, weight_factor: float):
+    def initial_setpoint(setpoints: List[float] | Scenario) -> float:
+        return setpoints.initial_setpoint if isinstance(setpoints, Scenario) else setpoints[0]
+
+    @staticmethod
+    def execute(pid_args: Tuple[float, float, float], mass: float, delta_t, setpoints: List[float] | Scenario, external_force: List[float] | None, error_fun: Callable, weight_factor: float, bound: SharedBound | None = None):
+        """
+        Simulates one PID-Controller. With a bound, candidates which can't beat it get aborted early and report an error
+        of inf.
+        If setpoints is a Scenario, it also provides the external force and external_force may be None.
+        """
         kp, ki, kd = pid_args
         simulation = Simulation(mass=mass, delta_t=delta_t)
-        pid_controller = PIDController(kp, ki, kd, setpoints[0])
+        pid_controller = PIDController(kp, ki, kd, BruteForcePlatform.initial_setpoint(setpoints))
         agent = BruteForceAgent(simulation, pid_controller, error_fun)
-        error, positions = agent.run(setpoints, external_force, weight_factor)
+        error, positions = agent.run(setpoints, external_force, weight_factor, bound)
 
         return kp, ki, kd, error, positions
+
+    @staticmethod
+    def execute_batch(pid_args: np.ndarray, mass: float, delta_t, setpoints: List[float] | Scenario, external_force: List[float] | None, error_fun: Callable = fitness_batch, weight_factor: float = 1, bound: SharedBound | None = None):
+        """
+        Simulates a whole batch of PID-Controllers in lockstep
+        :param pid_args: The (kp, ki, kd) combinations as (N, 3) Matrix
+        :param error_fun: Fitness function which scores an (N, T) Matrix of positions at once
+        :param bound: Optional best-so-far bound, without one every candidate gets simulated completely
+        :return: Arrays of kp, ki, kd and errors of shape (N,) and the positions as (N, T) Matrix
+        """
+        pid_args = np.asarray(pid_args, dtype=float).reshape(-1, 3)
+        kp, ki, kd = pid_args[:, 0], pid_args[:, 1], pid_args[:, 2]
+        simulation = BatchSimulation(len(pid_args), mass=mass, delta_t=delta_t)
+        pid_controller = BatchPIDController(kp, ki, kd, BruteForcePlatform.initial_setpoint(setpoints))
+        agent = BatchBruteForceAgent(simulation, pid_controller, error_fun)
+        errors, positions = agent.run(setpoints, external_force, weight_factor, bound)
+
+        return kp, ki, kd, errors, positions
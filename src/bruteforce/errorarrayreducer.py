@@ -0,0 +1,25 @@
+import numpy as np
+
+from src.bruteforce.reducer import Reducer
+
+
+class ErrorArrayReducer(Reducer):
+    """
+    Keeps the error of every grid point in one compact Array, indexed by the flat grid index.
+    """
+    def __init__(self, size: int, dtype: type = np.float32):
+        self.size = size
+        self.dtype = dtype
+        self.errors = None
+
+    def partial(self, indices: np.ndarray, gains: np.ndarray, errors: np.ndarray, positions: np.ndarray | None):
+        return indices[0], errors.astype(self.dtype)
+
+    def merge(self, partial_result):
+        if self.errors is None:
+            self.errors = np.full(self.size, np.nan, dtype=self.dtype)
+        start, errors = partial_result
+        self.errors[start:start + len(errors)] = errors
+
+    def result(self) -> np.ndarray:
+        return self.errors
@@ -0,0 +1,37 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+class GainGrid:
+    """
+    Regular (kp, ki, kd) grid which maps every grid point to a flat integer index. The order of the indices is the same
+    as the one of itertools.product(p, i, d), so the last axis varies the fastest.
+    """
+    def __init__(self, p: Sequence[float], i: Sequence[float], d: Sequence[float]):
+        self.p = np.asarray(p, dtype=float)
+        self.i = np.asarray(i, dtype=float)
+        self.d = np.asarray(d, dtype=float)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return len(self.p), len(self.i), len(self.d)
+
+    def __len__(self) -> int:
+        return len(self.p) * len(self.i) * len(self.d)
+
+    def gains(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Looks up the gains of grid points
+        :param indices: Flat indices of the grid points
+        :return: The (kp, ki, kd) combinations as (N, 3) Matrix
+        """
+        p_idx, i_idx, d_idx = np.unravel_index(indices, self.shape)
+
+        return np.column_stack((self.p[p_idx], self.i[i_idx], self.d[d_idx]))
+
+    def gain_range(self, start: int, stop: int) -> np.ndarray:
+        return self.gains(np.arange(start, stop))
+
+    def ranges(self, chunk_size: int) -> list[Tuple[int, int]]:
+        return [(start, min(start + chunk_size, len(self))) for start in range(0, len(self), chunk_size)]
@@ -0,0 +1,63 @@
+from collections import Counter
+from math import log
+
+import numpy as np
+
+from src.bruteforce.reducer import Reducer
+
+
+class QuantileSketchReducer(Reducer):
+    """
+    Streaming quantile sketch of the errors with bounded memory. Errors get counted in logarithmically sized buckets,
+    so every quantile is reported with the given relative accuracy, no matter how many grid points were evaluated.
+    Errors of inf or NaN are counted separately and rank behind every finite error.
+    """
+    def __init__(self, relative_accuracy: float = 0.01):
+        assert 0 < relative_accuracy < 1
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.buckets = Counter()
+        self.num_zeros = 0
+        self.num_infinite = 0
+
+    @property
+    def count(self) -> int:
+        return sum(self.buckets.values()) + self.num_zeros + self.num_infinite
+
+    def partial(self, indices: np.ndarray, gains: np.ndarray, errors: np.ndarray, positions: np.ndarray | None):
+        is_finite = np.isfinite(errors)
+        finite_errors = errors[is_finite]
+        positive_errors = finite_errors[finite_errors > 0]
+        bucket_indices, counts = np.unique(np.ceil(np.log(positive_errors) / log(self.gamma)).astype(int), return_counts=True)
+
+        return dict(zip(bucket_indices.tolist(), counts.tolist())), len(finite_errors) - len(positive_errors), int(np.sum(~is_finite))
+
+    def merge(self, partial_result):
+        buckets, num_zeros, num_infinite = partial_result
+        self.buckets.update(buckets)
+        self.num_zeros += num_zeros
+        self.num_infinite += num_infinite
+
+    def quantile(self, q: float) -> float:
+        """
+        :param q: Quantile between 0 and 1
+        :return: Approximated error at the quantile
+        """
+        assert 0 <= q <= 1
+        assert self.count > 0
+        rank = int(q * (self.count - 1))
+        if rank < self.num_zeros:
+            return 0.0
+        seen = self.num_zeros
+        for bucket_index in sorted(self.buckets):
+            seen += self.buckets[bucket_index]
+            if rank < seen:
+                return 2 * self.gamma ** bucket_index / (self.gamma + 1)
+
+        return float('inf')
+
+    def percentile(self, percentile: float) -> float:
+        return self.quantile(percentile / 100)
+
+    def result(self) -> 'QuantileSketchReducer':
+        return self
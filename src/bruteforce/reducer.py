@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from typing import Any, List, Tuple
+
+import numpy as np
+
+
+class Reducer(ABC):
+    """
+    Condenses the results of a sweep while it is running, so the parent never has to hold every trajectory.
+    The reducer gets sent to every worker once, where partial condenses the results of one chunk. The parent merges
+    the partial results of all chunks. State which only the parent needs should therefore be allocated lazily in merge.
+    """
+    # Whether partial needs the simulated positions of the chunk
+    keeps_positions = False
+
+    def pending(self, ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Filters the index ranges which still have to be evaluated, e.g. to resume an interrupted sweep
+        """
+        return ranges
+
+    @abstractmethod
+    def partial(self, indices: np.ndarray, gains: np.ndarray, errors: np.ndarray, positions: np.ndarray | None) -> Any:
+        """
+        Condenses the results of one chunk inside the worker
+        :param indices: Flat grid indices of the chunk
+        :param gains: The (kp, ki, kd) combinations of the chunk as (N, 3) Matrix
+        :param errors: Errors of the chunk of shape (N,)
+        :param positions: Positions as (N, T) Matrix if keeps_positions is set, otherwise None
+        :return: Compact partial result which gets sent back to the parent
+        """
+        pass
+
+    @abstractmethod
+    def merge(self, partial_result: Any):
+        pass
+
+    @abstractmethod
+    def result(self) -> Any:
+        pass
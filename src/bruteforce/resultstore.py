@@ -0,0 +1,114 @@
+import os
+from typing import List, Tuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from src.bruteforce.gaingrid import GainGrid
+from src.bruteforce.reducer import Reducer
+
+
+class ResultStore(Reducer):
+    """
+    Checkpointed result store of a sweep. The errors get written into a memory-mapped .npy file, indexed by the flat
+    grid index, together with a bitmap of the completed indices. A restarted sweep skips every finished chunk and the
+    results can be read back afterwards without copying them into memory.
+
+    The directory contains:
+        grid.npz        The axes of the GainGrid, to make sure a restart continues the same sweep
+        errors.npy      Errors of all grid points, NaN where not evaluated yet
+        completed.npy   Bitmap of the evaluated grid points, packed with np.packbits
+    """
+    def __init__(self, directory: str, grid: GainGrid | None = None, dtype: type = np.float64, read_only: bool = False):
+        self.directory = directory
+        self.read_only = read_only
+        self._errors = None
+        self._completed = None
+
+        grid_path = os.path.join(directory, 'grid.npz')
+        if os.path.exists(grid_path):
+            with np.load(grid_path) as axes:
+                stored_grid = GainGrid(axes['p'], axes['i'], axes['d'])
+            if grid is not None and not all(np.array_equal(a, b) for a, b in zip((grid.p, grid.i, grid.d), (stored_grid.p, stored_grid.i, stored_grid.d))):
+                raise ValueError(f'The result store in {directory} belongs to a different grid')
+            self.grid = stored_grid
+        else:
+            if grid is None or read_only:
+                raise FileNotFoundError(f'There is no result store in {directory}')
+            self.grid = grid
+            os.makedirs(directory, exist_ok=True)
+            errors = open_memmap(os.path.join(directory, 'errors.npy'), mode='w+', dtype=dtype, shape=(len(grid),))
+            errors[:] = np.nan
+            errors.flush()
+            completed = open_memmap(os.path.join(directory, 'completed.npy'), mode='w+', dtype=np.uint8, shape=((len(grid) + 7) // 8,))
+            completed.flush()
+            del errors, completed
+            # The grid gets written last, so it marks a fully initialized store
+            np.savez(grid_path, p=grid.p, i=grid.i, d=grid.d)
+
+    @staticmethod
+    def open(directory: str) -> 'ResultStore':
+        """
+        Opens an existing store read-only, e.g. to analyze the results straight off the disk
+        """
+        return ResultStore(directory, read_only=True)
+
+    def __getstate__(self):
+        # The store gets sent to the workers, which must not receive the memory maps
+        state = self.__dict__.copy()
+        state['_errors'] = None
+        state['_completed'] = None
+
+        return state
+
+    @property
+    def errors(self) -> np.memmap:
+        if self._errors is None:
+            self._errors = open_memmap(os.path.join(self.directory, 'errors.npy'), mode='r' if self.read_only else 'r+')
+
+        return self._errors
+
+    @property
+    def bitmap(self) -> np.memmap:
+        if self._completed is None:
+            self._completed = open_memmap(os.path.join(self.directory, 'completed.npy'), mode='r' if self.read_only else 'r+')
+
+        return self._completed
+
+    @property
+    def completed(self) -> np.ndarray:
+        """
+        :return: Boolean mask of the evaluated grid points
+        """
+        return np.unpackbits(self.bitmap, count=len(self.grid)).astype(bool)
+
+    @property
+    def is_complete(self) -> bool:
+        return bool(np.all(self.completed))
+
+    def gains(self, indices: np.ndarray) -> np.ndarray:
+        return self.grid.gains(indices)
+
+    def pending(self, ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        completed = self.completed
+
+        return [(start, stop) for start, stop in ranges if not np.all(completed[start:stop])]
+
+    def partial(self, indices: np.ndarray, gains: np.ndarray, errors: np.ndarray, positions: np.ndarray | None):
+        return indices[0], errors
+
+    def merge(self, partial_result):
+        start, errors = partial_result
+        stop = start + len(errors)
+        self.errors[start:stop] = errors
+        self.errors.flush()
+
+        # Mark the range as completed only after its errors reached the disk
+        first_byte, last_byte = start // 8, (stop + 7) // 8
+        bits = np.unpackbits(self.bitmap[first_byte:last_byte])
+        bits[start - first_byte * 8:stop - first_byte * 8] = 1
+        self.bitmap[first_byte:last_byte] = np.packbits(bits)
+        self.bitmap.flush()
+
+    def result(self) -> np.memmap:
+        return self.errors
@@ -0,0 +1,39 @@
+import multiprocessing
+from math import inf
+from typing import Iterable
+
+import numpy as np
+
+
+class SharedBound:
+    """
+    Best-so-far error bound which is shared between the workers of a multiprocessing.Pool. It keeps the k smallest
+    errors seen so far, a candidate whose partial error already exceeds the k-th smallest one can't make it into the
+    top-k anymore. The bound has to be handed to the workers on creation of the pool, e.g. as initargs, and gets
+    passed explicitly to every evaluation which should be pruned:
+
+        bound = SharedBound(k=1)
+        BruteForcePlatform.execute_batch(pid_args, mass, delta_t, setpoints, external_force, bound=bound)
+    """
+    # Relative slack which absorbs the rounding differences between the incremental and the exact Fitness Value
+    TOLERANCE = 1e-9
+
+    def __init__(self, k: int = 1):
+        assert k >= 1
+        self.errors = multiprocessing.Array('d', [inf] * k)
+
+    @property
+    def cutoff(self) -> float:
+        return max(self.errors.get_obj())
+
+    def exceeds(self, partial_error: float) -> bool:
+        return partial_error > self.cutoff * (1 + self.TOLERANCE)
+
+    def update(self, errors: float | Iterable[float]):
+        with self.errors.get_lock():
+            for error in np.sort(np.atleast_1d(errors))[:len(self.errors)]:
+                largest_idx = int(np.argmax(self.errors.get_obj()))
+                if error < self.errors[largest_idx]:
+                    self.errors[largest_idx] = error
+                else:
+                    break
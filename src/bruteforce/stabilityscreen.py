@@ -0,0 +1,69 @@
+from math import radians
+
+import numpy as np
+
+from src.simulation import Simulation
+
+
+class StabilityScreen:
+    """
+    Analytic pre-screen which rejects PID gains whose closed loop diverges, before they get simulated.
+
+    The seesaw of the Simulation is linearized around the horizontal position (sin(angle) = angle, no rolling
+    friction, no angle clamping), which gives the discrete plant
+        v[n+1] = v[n] - g / m * angle[n] * delta_t
+        x[n+1] = x[n] + v[n+1] * delta_t
+    with the angle in radians. Together with the discrete PID law of PIDController.next the closed loop has the
+    characteristic polynomial
+        (z - 1)^3 - K * ((kp + ki + kd) * z^2 - (kp + 2 * kd) * z + kd),    K = g * delta_t^2 / m * pi / 180
+    whose roots have to lie within the unit circle.
+    """
+    # Without integral gain the polynomial has a root at exactly z = 1, which eigvals returns as 1 +- 1e-14
+    EPSILON = 1e-9
+
+    @staticmethod
+    def characteristic_polynomials(pid_args: np.ndarray, mass: float, delta_t: float) -> np.ndarray:
+        """
+        Calculates the closed-loop characteristic polynomials of all gain combinations
+        :param pid_args: The (kp, ki, kd) combinations as (N, 3) Matrix
+        :return: Coefficients as (N, 4) Matrix, highest power first
+        """
+        pid_args = np.asarray(pid_args, dtype=float).reshape(-1, 3)
+        kp, ki, kd = pid_args[:, 0], pid_args[:, 1], pid_args[:, 2]
+        plant_gain = Simulation.GRAVITY_CONSTANT * delta_t ** 2 / mass * radians(1)
+
+        return np.column_stack((
+            np.ones(len(pid_args)),
+            -3 - plant_gain * (kp + ki + kd),
+            3 + plant_gain * (kp + 2 * kd),
+            -1 - plant_gain * kd
+        ))
+
+    @staticmethod
+    def spectral_radii(pid_args: np.ndarray, mass: float, delta_t: float) -> np.ndarray:
+        """
+        Calculates the largest absolute root of every characteristic polynomial in one batched eigenvalue call
+        :return: Spectral radii of shape (N,), values above 1 belong to divergent closed loops
+        """
+        coefficients = StabilityScreen.characteristic_polynomials(pid_args, mass, delta_t)
+
+        # The roots of a monic polynomial are the eigenvalues of its companion matrix
+        companion_matrices = np.zeros((len(coefficients), 3, 3))
+        companion_matrices[:, 0, :] = -coefficients[:, 1:]
+        companion_matrices[:, 1, 0] = 1
+        companion_matrices[:, 2, 1] = 1
+
+        return np.max(np.abs(np.linalg.eigvals(companion_matrices)), axis=1)
+
+    @staticmethod
+    def mask(pid_args: np.ndarray, mass: float, delta_t: float, tolerance: float = 0.0) -> np.ndarray:
+        """
+        Decides which gain combinations are worth simulating
+        :param tolerance: Allowed excess of the spectral radius over 1. Larger values keep more borderline candidates
+        and therefore reject less candidates which only the nonlinear effects would have stabilized. Marginally stable
+        candidates, e.g. every one with ki = 0, are kept even without tolerance
+        :return: Boolean mask of shape (N,), True for stable or borderline candidates
+        """
+        assert tolerance >= 0
+
+        return StabilityScreen.spectral_radii(pid_args, mass, delta_t) <= 1 + tolerance + StabilityScreen.EPSILON
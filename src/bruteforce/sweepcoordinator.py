@@ -0,0 +1,222 @@
+import copy
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque, Counter
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client, Connection
+from typing import List, Tuple, Any, Dict
+
+import numpy as np
+
+from src.simulation import Scenario
+from src.bruteforce.gaingrid import GainGrid
+from src.bruteforce.reducer import Reducer
+from src.bruteforce.errorarrayreducer import ErrorArrayReducer
+from src.bruteforce.sweepworker import SweepWorker
+
+
+class SweepCoordinator:
+    """
+    Distributes the evaluation of a GainGrid over SweepWorkers on any number of machines. The coordinator serves the
+    sweep via a multiprocessing.connection Listener, every worker connection gets handled by its own thread. Workers
+    lease index ranges of the grid, evaluate them and send back the partial results of the Reducer, which the
+    coordinator merges.
+
+    A lease which doesn't get completed within lease_timeout seconds, e.g. because its worker died, gets handed out
+    again. A range which gets completed twice is only merged once.
+
+    Usage on other machines, with the address and authkey of the coordinator:
+        SweepWorker(('coordinator-host', port), authkey).run()
+    """
+    # Methods the workers may call
+    REMOTE_METHODS = ('task', 'lease', 'complete', 'is_finished')
+
+    def __init__(
+            self,
+            grid: GainGrid,
+            mass: float,
+            delta_t: float,
+            setpoints: List[float] | Scenario,
+            external_force: List[float] | None,
+            weight_factor: float,
+            chunk_size: int = 1024,
+            lease_timeout: float = 60.0,
+            stability_tolerance: float | None = None,
+            address: Tuple[str, int] = ('127.0.0.1', 0),
+            authkey: bytes | None = None):
+        """
+        :param address: Address the coordinator listens on, port 0 picks a free port. Use ('0.0.0.0', port) to accept
+        workers of other machines
+        :param authkey: Shared secret of coordinator and workers, a random one gets generated if not specified
+        """
+        if not isinstance(setpoints, Scenario):
+            assert len(setpoints) == len(external_force)
+            setpoints, external_force = np.asarray(setpoints, dtype=float), np.asarray(external_force, dtype=float)
+        self.grid = grid
+        self.mass = mass
+        self.delta_t = delta_t
+        self.setpoints = setpoints
+        self.external_force = external_force
+        self.weight_factor = weight_factor
+        self.chunk_size = chunk_size
+        self.lease_timeout = lease_timeout
+        self.stability_tolerance = stability_tolerance
+        self.address = address
+        self.authkey = authkey or os.urandom(16)
+
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._reducer = None
+        self._task = None
+        self._pending = deque()
+        # Deadlines of the active leases and the ranges of all leases handed out
+        self._leases = {}
+        self._lease_ranges = {}
+        self._completed = set()
+        self._num_ranges = 0
+        self._next_lease_id = 0
+        self._num_reassigned = 0
+        self._completed_by = Counter()
+
+    def task(self) -> Tuple[Any, ...]:
+        """
+        :return: Everything a worker needs to evaluate leased ranges
+        """
+        return self._task
+
+    def lease(self, worker_id: str) -> Tuple[int, int, int] | None:
+        """
+        :return: Lease id, start and stop index of the range to evaluate, or None if there is nothing to lease right now
+        """
+        with self._lock:
+            # Hand out the ranges of expired leases again
+            now = time.monotonic()
+            for lease_id, deadline in list(self._leases.items()):
+                if deadline < now:
+                    del self._leases[lease_id]
+                    index_range = self._lease_ranges[lease_id]
+                    if index_range[0] not in self._completed:
+                        self._pending.append(index_range)
+                        self._num_reassigned += 1
+
+            if not self._pending:
+                return None
+            index_range = self._pending.popleft()
+            lease_id = self._next_lease_id
+            self._next_lease_id += 1
+            self._leases[lease_id] = now + self.lease_timeout
+            self._lease_ranges[lease_id] = index_range
+
+            return lease_id, index_range[0], index_range[1]
+
+    def complete(self, worker_id: str, lease_id: int, partial_result: Any):
+        with self._lock:
+            self._leases.pop(lease_id, None)
+            index_range = self._lease_ranges[lease_id]
+            if index_range[0] in self._completed:
+                return
+
+            self._reducer.merge(partial_result)
+            self._completed.add(index_range[0])
+            self._completed_by[worker_id] += 1
+            # The range could have been handed out again in the meantime
+            if index_range in self._pending:
+                self._pending.remove(index_range)
+            if len(self._completed) == self._num_ranges:
+                self._finished.set()
+
+    def is_finished(self) -> bool:
+        return self._finished.is_set()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        :return: Number of completed and total ranges, leases which got handed out again and ranges per worker
+        """
+        with self._lock:
+            return {
+                'completed': len(self._completed),
+                'total': self._num_ranges,
+                'reassigned': self._num_reassigned,
+                'workers': dict(self._completed_by)
+            }
+
+    def run(self, reducer: Reducer | None = None, num_local_workers: int = 0) -> Any:
+        """
+        Serves the sweep until every range got evaluated
+        :param reducer: Reducer which condenses the results, e.g. a TopKReducer or a ResultStore
+        :param num_local_workers: Number of SweepWorker processes which get started on this machine
+        :return: The result of the reducer. Without a reducer a (N, 4) Matrix with the columns kp, ki, kd, error in the
+        order of the grid indices
+        """
+        if reducer is None:
+            errors = self.run(ErrorArrayReducer(len(self.grid), dtype=float), num_local_workers)
+
+            return np.column_stack((self.grid.gain_range(0, len(self.grid)), errors))
+
+        ranges = reducer.pending(self.grid.ranges(self.chunk_size))
+        self._reducer = reducer
+        # The workers get a copy of the reducer before anything got merged into it
+        self._task = (self.grid, self.mass, self.delta_t, self.setpoints, self.external_force, self.weight_factor, self.stability_tolerance, copy.deepcopy(reducer))
+        self._pending = deque(ranges)
+        self._leases = {}
+        self._lease_ranges = {}
+        self._completed = set()
+        self._num_ranges = len(ranges)
+        self._finished.clear()
+        if not ranges:
+            return reducer.result()
+
+        listener = Listener(self.address, authkey=self.authkey)
+        self.address = listener.address
+        server_thread = threading.Thread(target=self._serve, args=(listener,), daemon=True)
+        server_thread.start()
+
+        workers = [
+            multiprocessing.Process(target=SweepWorker.start, args=(self.address, self.authkey, f'local-{idx}'))
+            for idx in range(num_local_workers)
+        ]
+        try:
+            for worker in workers:
+                worker.start()
+            while not self._finished.wait(0.5):
+                if workers and not any(worker.is_alive() for worker in workers):
+                    raise RuntimeError('All local workers exited before the sweep was finished')
+        finally:
+            for worker in workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+            # Closing the Listener doesn't interrupt a pending accept, a last connection wakes it up
+            self._finished.set()
+            Client(self.address, authkey=self.authkey).close()
+            server_thread.join()
+            listener.close()
+
+        return reducer.result()
+
+    def _serve(self, listener: Listener):
+        while True:
+            try:
+                connection = listener.accept()
+            except (OSError, AuthenticationError):
+                # Connections with a wrong authkey get rejected
+                continue
+            if self._finished.is_set():
+                connection.close()
+                return
+            threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def _handle(self, connection: Connection):
+        with connection:
+            while True:
+                try:
+                    method, args = connection.recv()
+                except (EOFError, OSError):
+                    return
+                if method not in self.REMOTE_METHODS:
+                    # Answer with the error instead of calling arbitrary attributes, the worker raises it
+                    connection.send(ValueError(f'Unknown remote method {method!r}, choose one of {", ".join(self.REMOTE_METHODS)}'))
+                    continue
+                connection.send(getattr(self, method)(*args))
@@ -0,0 +1,175 @@
+import multiprocessing
+import os
+import time
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Tuple, Any
+
+import numpy as np
+
+from src.simulation import Scenario
+from src.instrumentation import Instrumentation, SweepProgress
+from src.bruteforce.bruteforceplatform import BruteForcePlatform
+from src.bruteforce.gaingrid import GainGrid
+from src.bruteforce.sharedbound import SharedBound
+from src.bruteforce.stabilityscreen import StabilityScreen
+from src.bruteforce.reducer import Reducer
+from src.bruteforce.errorarrayreducer import ErrorArrayReducer
+
+
+class SweepRunner:
+    """
+    Evaluates a whole GainGrid on a multiprocessing.Pool. The setpoints and the external force get published once via
+    shared memory, the workers only receive index ranges of the grid and only send back what the Reducer keeps of
+    their range.
+
+    With a SweepProgress the workers additionally report how long they worked on every chunk and its best error. If
+    the Instrumentation is enabled, the workers enable it as well and send their stats along with every chunk.
+    """
+    _worker_state = None
+
+    def __init__(
+            self,
+            grid: GainGrid,
+            mass: float,
+            delta_t: float,
+            setpoints: List[float],
+            external_force: List[float],
+            weight_factor: float,
+            num_workers: int | None = None,
+            chunk_size: int = 1024,
+            bound: SharedBound | None = None,
+            stability_tolerance: float | None = None,
+            progress: SweepProgress | None = None):
+        assert len(setpoints) == len(external_force)
+        self.grid = grid
+        self.mass = mass
+        self.delta_t = delta_t
+        self.setpoints = np.asarray(setpoints, dtype=float)
+        self.external_force = np.asarray(external_force, dtype=float)
+        self.weight_factor = weight_factor
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self.bound = bound
+        self.stability_tolerance = stability_tolerance
+        self.progress = progress
+
+    def run(self, reducer: Reducer | None = None) -> Any:
+        """
+        Runs the sweep. Candidates which got rejected by the stability screen or aborted by the bound have an error of inf
+        :param reducer: Reducer which condenses the results, e.g. a TopKReducer, a QuantileSketchReducer or a
+        ResultStore, which makes the sweep resumable
+        :return: The result of the reducer. Without a reducer a (N, 4) Matrix with the columns kp, ki, kd, error in the
+        order of the grid indices
+        """
+        if reducer is None:
+            errors = self.run(ErrorArrayReducer(len(self.grid), dtype=float))
+
+            return np.column_stack((self.grid.gain_range(0, len(self.grid)), errors))
+
+        for partial_result in self.stream(reducer.pending(self.grid.ranges(self.chunk_size)), reducer):
+            reducer.merge(partial_result)
+
+        return reducer.result()
+
+    def stream(self, ranges: List[Tuple[int, int]], reducer: Reducer):
+        """
+        Evaluates the given index ranges and yields the partial results of the reducer in the order the chunks get finished
+        """
+        scenario_memory = SharedMemory(create=True, size=self.setpoints.nbytes + self.external_force.nbytes)
+        try:
+            scenario = np.ndarray((2, len(self.setpoints)), dtype=float, buffer=scenario_memory.buf)
+            scenario[0], scenario[1] = self.setpoints, self.external_force
+            del scenario
+            worker_args = (
+                scenario_memory.name,
+                len(self.setpoints),
+                self.grid,
+                self.mass,
+                self.delta_t,
+                self.weight_factor,
+                self.bound,
+                self.stability_tolerance,
+                reducer,
+                Instrumentation.enabled
+            )
+            if self.progress is not None:
+                self.progress.start(sum(stop - start for start, stop in ranges))
+            with multiprocessing.Pool(self.num_workers, initializer=SweepRunner.initialize_worker, initargs=worker_args) as pool:
+                for partial_result, (worker, seconds, evaluations, best_error, stats) in pool.imap_unordered(SweepRunner.evaluate_range, ranges):
+                    if stats is not None:
+                        Instrumentation.merge(stats)
+                    if self.progress is not None:
+                        self.progress.update(worker, evaluations, seconds, best_error)
+                    yield partial_result
+            if self.progress is not None:
+                self.progress.finish()
+        finally:
+            scenario_memory.close()
+            scenario_memory.unlink()
+
+    @staticmethod
+    def initialize_worker(scenario_memory_name: str, scenario_length: int, grid: GainGrid, mass: float, delta_t: float, weight_factor: float, bound: SharedBound | None, stability_tolerance: float | None, reducer: Reducer, instrumentation_enabled: bool = False):
+        # Attach to the scenario of the parent without copying it. The parent owns the memory and unlinks it.
+        scenario_memory = SharedMemory(name=scenario_memory_name)
+        scenario = np.ndarray((2, scenario_length), dtype=float, buffer=scenario_memory.buf)
+        # Forked workers inherit the stats of the parent, which must not be sent back
+        Instrumentation.reset()
+        if instrumentation_enabled:
+            Instrumentation.enable()
+        SweepRunner._worker_state = (scenario_memory, scenario, grid, mass, delta_t, weight_factor, bound, stability_tolerance, reducer)
+
+    @staticmethod
+    def evaluate_range(index_range: Tuple[int, int]) -> Tuple[Any, Tuple[int, float, int, float, dict | None]]:
+        """
+        :return: The partial result of the reducer and the report of the worker: its pid, the seconds it spent on the
+        range, the number of evaluations, the best error of the range and the stats of the Instrumentation if enabled
+        """
+        _, scenario, grid, mass, delta_t, weight_factor, bound, stability_tolerance, reducer = SweepRunner._worker_state
+        start_time = time.perf_counter()
+        start, stop = index_range
+        results = SweepRunner.evaluate_gains(grid, start, stop, mass, delta_t, scenario[0], scenario[1], weight_factor, stability_tolerance, reducer.keeps_positions, bound)
+        partial_result = reducer.partial(*results)
+        errors = results[2]
+        best_error = float(np.nanmin(errors)) if not np.all(np.isnan(errors)) else np.inf
+        stats = Instrumentation.collect() if Instrumentation.enabled else None
+
+        return partial_result, (os.getpid(), time.perf_counter() - start_time, stop - start, best_error, stats)
+
+    @staticmethod
+    def evaluate_chunk(grid: GainGrid, start: int, stop: int, mass: float, delta_t: float, setpoints: np.ndarray | Scenario, external_force: np.ndarray | None, weight_factor: float, stability_tolerance: float | None, reducer: Reducer) -> Any:
+        """
+        Evaluates the grid indices from start to stop
+        :return: The partial result of the reducer for the chunk
+        """
+        return reducer.partial(*SweepRunner.evaluate_gains(grid, start, stop, mass, delta_t, setpoints, external_force, weight_factor, stability_tolerance, reducer.keeps_positions))
+
+    @staticmethod
+    def evaluate_gains(grid: GainGrid, start: int, stop: int, mass: float, delta_t: float, setpoints: np.ndarray | Scenario, external_force: np.ndarray | None, weight_factor: float, stability_tolerance: float | None, keeps_positions: bool, bound: SharedBound | None = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray | None]:
+        """
+        :param bound: Optional best-so-far bound, candidates which can't beat it get aborted and report an error of inf
+        :return: Indices, gains, errors and the positions if keeps_positions is set, like Reducer.partial expects them
+        """
+        gains = grid.gain_range(start, stop)
+        errors = np.full(len(gains), np.inf)
+        positions = np.full((len(gains), len(setpoints)), np.nan) if keeps_positions else None
+
+        # Only simulate the candidates which pass the stability screen
+        is_candidate = np.ones(len(gains), dtype=bool)
+        if stability_tolerance is not None:
+            is_candidate = StabilityScreen.mask(gains, mass, delta_t, stability_tolerance)
+        Instrumentation.count('sweep.evaluations', int(np.count_nonzero(is_candidate)))
+        Instrumentation.count('sweep.screened_out', int(np.count_nonzero(~is_candidate)))
+        if np.any(is_candidate):
+            _, _, _, errors[is_candidate], candidate_positions = BruteForcePlatform.execute_batch(
+                gains[is_candidate],
+                mass,
+                delta_t,
+                setpoints,
+                external_force,
+                weight_factor=weight_factor,
+                bound=bound
+            )
+            if positions is not None:
+                positions[is_candidate] = candidate_positions
+
+        return np.arange(start, stop), gains, errors, positions
@@ -0,0 +1,67 @@
+import os
+import socket
+import time
+from multiprocessing.connection import Client
+from typing import Tuple, Any
+
+from src.bruteforce.sweeprunner import SweepRunner
+
+
+class SweepWorker:
+    """
+    Evaluates index ranges of a sweep which it leases from a SweepCoordinator, possibly running on another machine.
+    The ranges get evaluated like by the SweepRunner, only the partial results of the Reducer get sent back.
+    """
+    def __init__(self, address: Tuple[str, int], authkey: bytes, worker_id: str | None = None, poll_interval: float = 0.5):
+        self.address = address
+        self.authkey = authkey
+        self.worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}'
+        self.poll_interval = poll_interval
+        self._connection = None
+
+    @staticmethod
+    def start(address: Tuple[str, int], authkey: bytes, worker_id: str | None = None):
+        """
+        Entry point of worker processes
+        """
+        SweepWorker(address, authkey, worker_id).run()
+
+    def run(self) -> int:
+        """
+        Leases and evaluates ranges until the sweep is finished
+        :return: Number of ranges this worker evaluated
+        """
+        num_evaluated = 0
+        try:
+            self._connection = Client(self.address, authkey=self.authkey)
+        except ConnectionRefusedError:
+            # The coordinator already shut down
+            return num_evaluated
+
+        with self._connection:
+            try:
+                grid, mass, delta_t, setpoints, external_force, weight_factor, stability_tolerance, reducer = self._call('task')
+                while not self._call('is_finished'):
+                    lease = self._call('lease', self.worker_id)
+                    if lease is None:
+                        # Every range is leased, wait whether one of them expires
+                        time.sleep(self.poll_interval)
+                        continue
+
+                    lease_id, start, stop = lease
+                    partial_result = SweepRunner.evaluate_chunk(grid, start, stop, mass, delta_t, setpoints, external_force, weight_factor, stability_tolerance, reducer)
+                    self._call('complete', self.worker_id, lease_id, partial_result)
+                    num_evaluated += 1
+            except (EOFError, ConnectionError):
+                # The coordinator finished and closed the connection
+                pass
+
+        return num_evaluated
+
+    def _call(self, method: str, *args) -> Any:
+        self._connection.send((method, args))
+        reply = self._connection.recv()
+        if isinstance(reply, Exception):
+            raise reply
+
+        return reply
@@ -0,0 +1,46 @@
+from typing import Tuple
+
+import numpy as np
+
+from src.bruteforce.reducer import Reducer
+from src.genetic.fitness import rank_errors
+
+
+class TopKReducer(Reducer):
+    """
+    Keeps the k grid points with the smallest errors together with their full trajectories.
+    """
+    keeps_positions = True
+
+    def __init__(self, k: int):
+        assert k >= 1
+        self.k = k
+        self.indices = np.empty(0, dtype=int)
+        self.gains = np.empty((0, 3))
+        self.errors = np.empty(0)
+        self.positions = None
+
+    def select(self, indices: np.ndarray, gains: np.ndarray, errors: np.ndarray, positions: np.ndarray):
+        order = np.argsort(rank_errors(errors), kind='stable')[:self.k]
+
+        return indices[order], gains[order], errors[order], positions[order]
+
+    def partial(self, indices: np.ndarray, gains: np.ndarray, errors: np.ndarray, positions: np.ndarray | None):
+        return self.select(indices, gains, errors, positions)
+
+    def merge(self, partial_result):
+        indices, gains, errors, positions = partial_result
+        if self.positions is None:
+            self.positions = np.empty((0, positions.shape[1]))
+        self.indices, self.gains, self.errors, self.positions = self.select(
+            np.concatenate((self.indices, indices)),
+            np.concatenate((self.gains, gains)),
+            np.concatenate((self.errors, errors)),
+            np.concatenate((self.positions, positions))
+        )
+
+    def result(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        :return: Indices, Gains, Errors and Positions of the best grid points, sorted by error
+        """
+        return self.indices, self.gains, self.errors, self.positions
@@ -0,0 +1,7 @@
+from .evaluator import Evaluator
+from .serialevaluator import SerialEvaluator
+from .batchevaluator import BatchEvaluator
+from .poolevaluator import PoolEvaluator
+from .cachedevaluator import CachedEvaluator
+from .fidelityevaluator import FidelityEvaluator
+from .scenariobankevaluator import ScenarioBankEvaluator
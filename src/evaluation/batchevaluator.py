@@ -0,0 +1,31 @@
+from typing import List
+
+import numpy as np
+
+from src.bruteforce import BruteForcePlatform
+from src.evaluation.evaluator import Evaluator
+
+
+class BatchEvaluator(Evaluator):
+    """
+    Evaluates PID-Controllers with the lockstep batch engine in the current process. The batch gets split into chunks
+    of batch_size to bound the memory of the (N, T) position matrix.
+    """
+    def __init__(self, mass: float, delta_t: float, setpoints: List[float], external_force: List[float], weight_factor: float, batch_size: int = 2048):
+        super().__init__(mass, delta_t, setpoints, external_force, weight_factor)
+        self.batch_size = batch_size
+
+    def evaluate(self, gains: np.ndarray) -> np.ndarray:
+        gains = np.asarray(gains, dtype=float).reshape(-1, 3)
+        errors = np.empty(len(gains))
+        for start in range(0, len(gains), self.batch_size):
+            _, _, _, errors[start:start + self.batch_size], _ = BruteForcePlatform.execute_batch(
+                gains[start:start + self.batch_size],
+                self.mass,
+                self.delta_t,
+                self.setpoints,
+                self.external_force,
+                weight_factor=self.weight_factor
+            )
+
+        return errors
@@ -0,0 +1,113 @@
+import sqlite3
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import numpy as np
+
+from src.evaluation.evaluator import Evaluator
+
+
+class CachedEvaluator(Evaluator):
+    """
+    Memoizes the errors of another Evaluator. Results are keyed by the gains together with the fingerprint of the
+    scenario, so results of a different mass, timestep, scenario, weight factor or fitness version never get mixed up.
+
+    The first tier is an in-process LRU cache, the optional second tier an SQLite file which survives across sessions
+    and can be shared between processes.
+    """
+    def __init__(self, evaluator: Evaluator, max_size: int = 100_000, path: str | None = None):
+        super().__init__(evaluator.mass, evaluator.delta_t, evaluator.setpoints, evaluator.external_force, evaluator.weight_factor)
+        self.evaluator = evaluator
+        self.max_size = max_size
+        self.path = path
+        self.scenario_fingerprint = evaluator.fingerprint()
+        self.memory: OrderedDict[Tuple[float, float, float], float] = OrderedDict()
+        self.connection = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        # Connections can't be sent to other processes, every process opens its own one
+        state = self.__dict__.copy()
+        state['connection'] = None
+
+        return state
+
+    def fingerprint(self) -> str:
+        return self.scenario_fingerprint
+
+    def connect(self) -> sqlite3.Connection:
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, timeout=60)
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS errors ('
+                'fingerprint TEXT, kp REAL, ki REAL, kd REAL, error REAL, '
+                'PRIMARY KEY (fingerprint, kp, ki, kd))'
+            )
+
+        return self.connection
+
+    def remember(self, key: Tuple[float, float, float], error: float):
+        self.memory[key] = error
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.max_size:
+            self.memory.popitem(last=False)
+
+    def evaluate(self, gains: np.ndarray) -> np.ndarray:
+        keys = [tuple(pid_args) for pid_args in np.asarray(gains, dtype=float).reshape(-1, 3).tolist()]
+        found: Dict[Tuple[float, float, float], float] = {}
+
+        # Look up the in-process tier first
+        for key in keys:
+            if key in self.memory:
+                found[key] = self.memory[key]
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+
+        # Then the on-disk tier
+        missing = list(dict.fromkeys(key for key in keys if key not in found))
+        if missing and self.path is not None:
+            connection = self.connect()
+            for key in missing:
+                row = connection.execute(
+                    'SELECT error FROM errors WHERE fingerprint = ? AND kp = ? AND ki = ? AND kd = ?',
+                    (self.scenario_fingerprint, *key)
+                ).fetchone()
+                if row is not None:
+                    found[key] = np.nan if row[0] is None else row[0]
+                    self.remember(key, found[key])
+                    self.disk_hits += 1
+            missing = [key for key in missing if key not in found]
+
+        # Evaluate everything which is left in one call of the wrapped evaluator
+        if missing:
+            errors = self.evaluator.evaluate(np.array(missing))
+            self.misses += len(missing)
+            for key, error in zip(missing, errors.tolist()):
+                found[key] = error
+                self.remember(key, error)
+            if self.path is not None:
+                connection = self.connect()
+                with connection:
+                    connection.executemany(
+                        'INSERT OR REPLACE INTO errors VALUES (?, ?, ?, ?, ?)',
+                        [(self.scenario_fingerprint, *key, None if np.isnan(error) else error) for key, error in zip(missing, errors.tolist())]
+                    )
+
+        return np.array([found[key] for key in keys], dtype=float)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'size': len(self.memory)
+        }
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        self.evaluator.close()
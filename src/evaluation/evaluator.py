@@ -0,0 +1,119 @@
+import hashlib
+from abc import ABC, abstractmethod
+from functools import partial
+from types import CodeType
+from typing import List, Tuple, Callable, Any
+
+import numpy as np
+
+from src.genetic import FITNESS_VERSION
+
+
+class Evaluator(ABC):
+    """
+    Simulates PID-Controllers on a fixed scenario and scores them with the fitness function. The optimizers only talk
+    to this interface, so the evaluation backend can be swapped without touching them.
+    """
+    def __init__(self, mass: float, delta_t: float, setpoints: List[float], external_force: List[float], weight_factor: float):
+        assert len(setpoints) == len(external_force)
+        self.mass = mass
+        self.delta_t = delta_t
+        self.setpoints = setpoints
+        self.external_force = external_force
+        self.weight_factor = weight_factor
+
+    def fingerprint(self) -> str:
+        """
+        :return: Hash of everything besides the gains which influences the errors
+        """
+        scenario_hash = hashlib.sha256()
+        scenario_hash.update(repr((self.mass, self.delta_t, self.weight_factor, FITNESS_VERSION)).encode())
+        scenario_hash.update(np.asarray(self.setpoints, dtype=float).tobytes())
+        scenario_hash.update(np.asarray(self.external_force, dtype=float).tobytes())
+
+        return scenario_hash.hexdigest()
+
+    @staticmethod
+    def function_fingerprint(function: Callable) -> str:
+        """
+        :return: Hash of the code of a function together with its defaults and the values captured by its closure, so
+        lambdas or closures with the same name but different behaviour don't share cached errors
+        """
+        return hashlib.sha256(repr(Evaluator.describe(function, set())).encode()).hexdigest()
+
+    @staticmethod
+    def describe(value: Any, seen: set) -> Any:
+        # Functions which are already being described, e.g. recursive closures, are only referenced by their name
+        if callable(value) and id(value) in seen:
+            return 'recursion', getattr(value, '__qualname__', type(value).__qualname__)
+
+        if isinstance(value, partial):
+            seen.add(id(value))
+            return 'partial', Evaluator.describe(value.func, seen), Evaluator.describe(value.args, seen), Evaluator.describe(value.keywords, seen)
+
+        if hasattr(value, '__code__'):
+            seen.add(id(value))
+            closure = tuple(cell.cell_contents for cell in value.__closure__ or ())
+            return (
+                'function',
+                value.__module__,
+                value.__qualname__,
+                Evaluator.describe(value.__code__, seen),
+                Evaluator.describe(value.__defaults__, seen),
+                Evaluator.describe(value.__kwdefaults__, seen),
+                Evaluator.describe(closure, seen),
+                Evaluator.describe(getattr(value, '__self__', None), seen)
+            )
+
+        if isinstance(value, CodeType):
+            return 'code', value.co_code, value.co_names, Evaluator.describe(value.co_consts, seen)
+
+        if isinstance(value, np.ndarray):
+            return 'array', value.dtype.str, value.shape, value.tobytes()
+
+        if isinstance(value, (tuple, list)):
+            return type(value).__name__, tuple(Evaluator.describe(item, seen) for item in value)
+
+        if isinstance(value, dict):
+            return 'dict', tuple(sorted((repr(key), Evaluator.describe(item, seen)) for key, item in value.items()))
+
+        return repr(value)
+
+    @abstractmethod
+    def evaluate(self, gains: np.ndarray) -> np.ndarray:
+        """
+        Calculates the errors of PID-Controllers
+        :param gains: The (kp, ki, kd) combinations as (N, 3) Matrix
+        :return: Errors of shape (N,)
+        """
+        pass
+
+    def evaluate_async(self, gains: np.ndarray):
+        """
+        Starts the evaluation and returns a handle whose get method returns the errors. Backends which evaluate in
+        other processes return before the evaluation is finished, so the caller can do other work meanwhile.
+        """
+        return FinishedEvaluation(self.evaluate(gains))
+
+    def __call__(self, gains: Tuple[float, float, float]) -> float:
+        """
+        Calculates the error of a single PID-Controller, e.g. as cost function of scipy.optimize.minimize
+        """
+        return float(self.evaluate(np.asarray(gains, dtype=float).reshape(1, 3))[0])
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class FinishedEvaluation:
+    def __init__(self, errors: np.ndarray):
+        self.errors = errors
+
+    def get(self) -> np.ndarray:
+        return self.errors
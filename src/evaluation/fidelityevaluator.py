@@ -0,0 +1,75 @@
+from typing import List
+
+import numpy as np
+
+from src.bruteforce.batchbruteforceagent import BatchBruteForceAgent
+from src.genetic import fitness_batch
+from src.pid import BatchPIDController
+from src.simulation import BatchSimulation, Simulation
+from src.evaluation.evaluator import Evaluator
+
+
+class FidelityEvaluator(Evaluator):
+    """
+    Cheap low-fidelity variant of the BatchEvaluator. Only a prefix (horizon) of the scenario gets simulated, with a
+    timestep which is timestep_factor times coarser.
+
+    The PIDController works per step, so the gains get translated to keep the controller equivalent on the coarser
+    grid: the integral sums timestep_factor times fewer errors (ki * factor), the derivative spans timestep_factor
+    frames (kd / factor) and the seesaw may turn timestep_factor times further per step. The error gets multiplied by
+    the timestep_factor, so it stays comparable to the full-fidelity error of the same prefix.
+    """
+    def __init__(
+            self,
+            mass: float,
+            delta_t: float,
+            setpoints: List[float],
+            external_force: List[float],
+            weight_factor: float,
+            timestep_factor: int = 1,
+            horizon: float = 1.0,
+            batch_size: int = 2048,
+            max_angle_change: float = Simulation.MAX_ANGLE_CHANGE):
+        """
+        :param max_angle_change: Maximum angle change per step of the full-fidelity Simulation, the coarser steps allow
+        timestep_factor times as much
+        """
+        assert timestep_factor >= 1
+        assert 0 < horizon <= 1
+        super().__init__(mass, delta_t, setpoints, external_force, weight_factor)
+        self.timestep_factor = timestep_factor
+        self.horizon = horizon
+        self.batch_size = batch_size
+        self.max_angle_change = max_angle_change
+
+        num_steps = int(round(len(setpoints) * horizon))
+        self.low_fidelity_setpoints = np.asarray(setpoints, dtype=float)[:num_steps:timestep_factor]
+        self.low_fidelity_external_force = np.asarray(external_force, dtype=float)[:num_steps:timestep_factor]
+
+    @property
+    def relative_cost(self) -> float:
+        """
+        :return: Simulated steps per candidate compared to the full scenario
+        """
+        return len(self.low_fidelity_setpoints) / len(self.setpoints)
+
+    def fingerprint(self) -> str:
+        return f'{super().fingerprint()}-{self.timestep_factor}-{self.horizon}-{self.max_angle_change}'
+
+    def evaluate(self, gains: np.ndarray) -> np.ndarray:
+        gains = np.asarray(gains, dtype=float).reshape(-1, 3)
+        errors = np.empty(len(gains))
+        for start in range(0, len(gains), self.batch_size):
+            kp, ki, kd = gains[start:start + self.batch_size].T
+            simulation = BatchSimulation(
+                len(kp),
+                mass=self.mass,
+                delta_t=self.delta_t * self.timestep_factor,
+                max_angle_change=self.max_angle_change * self.timestep_factor
+            )
+            pid_controller = BatchPIDController(kp, ki * self.timestep_factor, kd / self.timestep_factor, self.low_fidelity_setpoints[0])
+            agent = BatchBruteForceAgent(simulation, pid_controller, fitness_batch)
+            batch_errors, _ = agent.run(self.low_fidelity_setpoints, self.low_fidelity_external_force, self.weight_factor)
+            errors[start:start + self.batch_size] = batch_errors * self.timestep_factor
+
+        return errors
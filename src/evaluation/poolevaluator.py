@@ -0,0 +1,101 @@
+import multiprocessing
+from multiprocessing.pool import AsyncResult
+from functools import partial
+from typing import List, Callable
+
+import numpy as np
+
+from src.bruteforce import BruteForcePlatform
+from src.genetic import fitness, fitness_batch
+from src.evaluation.evaluator import Evaluator
+
+
+class PoolEvaluator(Evaluator):
+    """
+    Evaluates PID-Controllers on a multiprocessing.Pool. The scenario gets sent to every worker once on creation of the
+    pool, the tasks only contain chunks of gains. Every worker either steps its chunk through the lockstep batch engine
+    (vectorized) or runs BruteForcePlatform.execute for one candidate after another. A custom error_fun scores one
+    trajectory at a time in both modes.
+    """
+    _worker_state = None
+
+    def __init__(
+            self,
+            mass: float,
+            delta_t: float,
+            setpoints: List[float],
+            external_force: List[float],
+            weight_factor: float,
+            num_workers: int | None = None,
+            chunk_size: int = 256,
+            vectorized: bool = True,
+            error_fun: Callable = fitness):
+        super().__init__(mass, delta_t, setpoints, external_force, weight_factor)
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self.vectorized = vectorized
+        self.error_fun = error_fun
+        self.pool = None
+
+    def start(self):
+        if self.pool is None:
+            worker_args = (self.mass, self.delta_t, list(self.setpoints), list(self.external_force), self.weight_factor, self.vectorized, self.error_fun)
+            self.pool = multiprocessing.Pool(self.num_workers, initializer=PoolEvaluator.initialize_worker, initargs=worker_args)
+
+    def fingerprint(self) -> str:
+        # Evaluators with different error functions must not share cached errors, the default one shares them with the
+        # other backends
+        if self.error_fun is fitness:
+            return super().fingerprint()
+
+        return f'{super().fingerprint()}-{self.function_fingerprint(self.error_fun)}'
+
+    def evaluate_async(self, gains: np.ndarray):
+        self.start()
+        gains = np.asarray(gains, dtype=float).reshape(-1, 3)
+        chunks = [gains[start:start + self.chunk_size] for start in range(0, len(gains), self.chunk_size)]
+
+        return PendingEvaluation(self.pool.map_async(PoolEvaluator.evaluate_chunk, chunks))
+
+    def evaluate(self, gains: np.ndarray) -> np.ndarray:
+        return self.evaluate_async(gains).get()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    @staticmethod
+    def initialize_worker(mass: float, delta_t: float, setpoints: List[float], external_force: List[float], weight_factor: float, vectorized: bool, error_fun: Callable):
+        PoolEvaluator._worker_state = (mass, delta_t, setpoints, external_force, weight_factor, vectorized, error_fun)
+
+    @staticmethod
+    def evaluate_chunk(gains: np.ndarray) -> np.ndarray:
+        mass, delta_t, setpoints, external_force, weight_factor, vectorized, error_fun = PoolEvaluator._worker_state
+        if vectorized:
+            error_fun_batch = fitness_batch if error_fun is fitness else partial(PoolEvaluator.score_rows, error_fun)
+            return BruteForcePlatform.execute_batch(gains, mass, delta_t, setpoints, external_force, error_fun_batch, weight_factor)[3]
+
+        return np.array([
+            BruteForcePlatform.execute(tuple(pid_args), mass, delta_t, setpoints, external_force, error_fun, weight_factor)[3]
+            for pid_args in gains
+        ], dtype=float)
+
+    @staticmethod
+    def score_rows(error_fun: Callable, positions: np.ndarray, setpoints: List[float], weight_factor: float) -> np.ndarray:
+        """
+        Scores the trajectories of the lockstep batch engine with an error function for single trajectories
+        :return: Errors of shape (N,)
+        """
+        return np.array([error_fun(row.tolist(), setpoints, weight_factor=weight_factor) for row in positions], dtype=float)
+
+
+class PendingEvaluation:
+    def __init__(self, async_result: AsyncResult):
+        self.async_result = async_result
+
+    def get(self) -> np.ndarray:
+        chunk_errors = self.async_result.get()
+
+        return np.concatenate(chunk_errors) if chunk_errors else np.empty(0)
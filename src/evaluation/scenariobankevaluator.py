@@ -0,0 +1,127 @@
+import hashlib
+import multiprocessing
+
+import numpy as np
+
+from src.bruteforce.batchbruteforceagent import BatchBruteForceAgent
+from src.genetic import fitness_batch, FITNESS_VERSION
+from src.pid import BatchPIDController
+from src.simulation import BatchSimulation, ScenarioBank
+from src.evaluation.evaluator import Evaluator
+
+
+class ScenarioBankEvaluator(Evaluator):
+    """
+    Scores every PID-Controller against a whole ScenarioBank. All (gains x scenarios) combinations of a chunk get
+    stepped through the lockstep batch engine at once, every row with its own mass, setpoints and external force.
+    With num_workers the chunks get spread over a multiprocessing.Pool.
+
+    The errors of the scenarios get aggregated into one error per controller:
+        'mean'          Mean error over all scenarios
+        'max'           Worst-case error
+        'percentile'    The given percentile of the errors
+    """
+    AGGREGATIONS = ('mean', 'max', 'percentile')
+    _worker_state = None
+
+    def __init__(
+            self,
+            bank: ScenarioBank,
+            delta_t: float,
+            weight_factor: float,
+            aggregation: str = 'mean',
+            percentile: float = 90,
+            batch_size: int = 4096,
+            num_workers: int | None = None):
+        super().__init__(bank.masses, delta_t, bank.setpoints, bank.external_forces, weight_factor)
+        if aggregation not in self.AGGREGATIONS:
+            raise ValueError(f'Unknown aggregation {aggregation!r}, choose one of {", ".join(self.AGGREGATIONS)}')
+        self.bank = bank
+        self.aggregation = aggregation
+        self.percentile = percentile
+        self.batch_size = batch_size
+        self.num_workers = num_workers
+        self.pool = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['pool'] = None
+
+        return state
+
+    def fingerprint(self) -> str:
+        scenario_hash = hashlib.sha256()
+        scenario_hash.update(repr((self.delta_t, self.weight_factor, FITNESS_VERSION, self.aggregation, self.percentile)).encode())
+        for values in (self.bank.masses, self.bank.setpoints, self.bank.external_forces):
+            scenario_hash.update(values.tobytes())
+
+        return scenario_hash.hexdigest()
+
+    def evaluate_scenarios(self, gains: np.ndarray) -> np.ndarray:
+        """
+        Calculates the errors of every PID-Controller in every scenario
+        :param gains: The (kp, ki, kd) combinations as (N, 3) Matrix
+        :return: Errors as (N, S) Matrix
+        """
+        gains = np.asarray(gains, dtype=float).reshape(-1, 3)
+        if self.num_workers is not None and len(gains) > 1:
+            if self.pool is None:
+                self.pool = multiprocessing.Pool(self.num_workers, initializer=ScenarioBankEvaluator.initialize_worker, initargs=(self,))
+            chunk_size = max(self.batch_size // len(self.bank), 1)
+            chunks = [gains[start:start + chunk_size] for start in range(0, len(gains), chunk_size)]
+
+            return np.vstack(self.pool.map(ScenarioBankEvaluator.evaluate_chunk, chunks))
+
+        return self.simulate_scenarios(gains)
+
+    def simulate_scenarios(self, gains: np.ndarray) -> np.ndarray:
+        num_scenarios = len(self.bank)
+        chunk_size = max(self.batch_size // num_scenarios, 1)
+        errors = np.empty((len(gains), num_scenarios))
+        for start in range(0, len(gains), chunk_size):
+            chunk = gains[start:start + chunk_size]
+            # Scenario-major rows: row s * n + c simulates candidate c in scenario s
+            kp, ki, kd = np.tile(chunk, (num_scenarios, 1)).T
+            masses = np.repeat(self.bank.masses, len(chunk))
+            setpoints = np.repeat(self.bank.setpoints, len(chunk), axis=0)
+            external_forces = np.repeat(self.bank.external_forces, len(chunk), axis=0)
+
+            simulation = BatchSimulation(len(kp), mass=masses, delta_t=self.delta_t)
+            pid_controller = BatchPIDController(kp, ki, kd, setpoints[:, 0])
+            agent = BatchBruteForceAgent(simulation, pid_controller, fitness_batch)
+            positions = agent.simulate(setpoints, external_forces).reshape(num_scenarios, len(chunk), -1)
+            for scenario_idx in range(num_scenarios):
+                errors[start:start + len(chunk), scenario_idx] = fitness_batch(
+                    positions[scenario_idx],
+                    self.bank.setpoints[scenario_idx],
+                    weight_factor=self.weight_factor
+                )
+
+        return errors
+
+    def aggregate(self, errors: np.ndarray) -> np.ndarray:
+        # Diverged runs count as infinitely bad
+        errors = np.where(np.isnan(errors), np.inf, errors)
+        if self.aggregation == 'mean':
+            return np.mean(errors, axis=1)
+        elif self.aggregation == 'max':
+            return np.max(errors, axis=1)
+
+        return np.percentile(errors, self.percentile, axis=1)
+
+    def evaluate(self, gains: np.ndarray) -> np.ndarray:
+        return self.aggregate(self.evaluate_scenarios(gains))
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    @staticmethod
+    def initialize_worker(evaluator: 'ScenarioBankEvaluator'):
+        ScenarioBankEvaluator._worker_state = evaluator
+
+    @staticmethod
+    def evaluate_chunk(gains: np.ndarray) -> np.ndarray:
+        return ScenarioBankEvaluator._worker_state.simulate_scenarios(gains)
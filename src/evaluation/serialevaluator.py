@@ -0,0 +1,37 @@
+from typing import List, Callable
+
+import numpy as np
+
+from src.bruteforce import BruteForcePlatform
+from src.genetic import fitness
+from src.evaluation.evaluator import Evaluator
+
+
+class SerialEvaluator(Evaluator):
+    """
+    Evaluates one PID-Controller after another with the scalar Simulation in the current process.
+    """
+    def __init__(self, mass: float, delta_t: float, setpoints: List[float], external_force: List[float], weight_factor: float, error_fun: Callable = fitness):
+        super().__init__(mass, delta_t, setpoints, external_force, weight_factor)
+        self.error_fun = error_fun
+
+    def fingerprint(self) -> str:
+        # Evaluators with different error functions must not share cached errors, the default one shares them with the
+        # other backends
+        if self.error_fun is fitness:
+            return super().fingerprint()
+
+        return f'{super().fingerprint()}-{self.function_fingerprint(self.error_fun)}'
+
+    def evaluate(self, gains: np.ndarray) -> np.ndarray:
+        return np.array([
+            BruteForcePlatform.execute(
+                tuple(pid_args),
+                self.mass,
+                self.delta_t,
+                self.setpoints,
+                self.external_force,
+                self.error_fun,
+                self.weight_factor
+            )[3] for pid_args in np.asarray(gains, dtype=float).reshape(-1, 3)
+        ], dtype=float)
@@ -1 +1,5 @@
-from .fitness import fitness
+from .fitness import fitness, fitness_batch, smooth_fitness, rank_errors, FITNESS_VERSION
+from .fitnessaccumulator import FitnessAccumulator
+from .batchfitnessaccumulator import BatchFitnessAccumulator
+from .population import Population
+from .geneticoptimizer import GeneticOptimizer
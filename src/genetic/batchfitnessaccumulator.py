@@ -0,0 +1,40 @@
+import numpy as np
+
+from src.genetic.fitnessaccumulator import FitnessAccumulator
+
+
+class BatchFitnessAccumulator(FitnessAccumulator):
+    """
+    Lockstep variant of the FitnessAccumulator which accumulates the Fitness Values of a whole batch at once.
+    """
+    def __init__(self, size: int, weight_factor: float = 1, threshold: float = 0.02):
+        super().__init__(weight_factor, threshold)
+        self.value = np.zeros(size)
+
+        self.prev_position = np.zeros(size)
+        self.prev_difference = np.zeros(size)
+        self.is_approaching = np.zeros(size, dtype=bool)
+
+    def add(self, position: np.ndarray, setpoint: float) -> np.ndarray:
+        difference = setpoint - position
+
+        # Decide on the weights of the previous step, which are known now that its successor is known
+        if setpoint != self.prev_setpoint:
+            self.is_approaching = np.ones_like(self.is_approaching)
+            weights = self.weight_factor
+        else:
+            weights = np.where(self.is_approaching, self.weight_factor, 1)
+            is_intersection = (self.prev_difference * difference <= 0) & (np.abs(position - self.prev_position) > self.threshold)
+            self.is_approaching = self.is_approaching & ~is_intersection
+        self.value = self.value + weights * np.abs(self.prev_difference)
+
+        self.prev_setpoint = setpoint
+        self.prev_position = position
+        self.prev_difference = difference
+
+        return self.value
+
+    def finish(self) -> np.ndarray:
+        weights = np.where(self.is_approaching, self.weight_factor, 1)
+
+        return self.value + weights * np.abs(self.prev_difference)
@@ -2,18 +2,24 @@ from typing import List, Tuple
 
 import numpy as np
 
+from src.simulation.scenario import Scenario
 
-def fitness(positions: List[float], setpoints: List[float], weight_factor: float = 1) -> float:
+# Has to be increased whenever a change of the fitness function changes its values, which invalidates cached results
+FITNESS_VERSION = 1
+
+
+def fitness(positions: List[float], setpoints: List[float] | Scenario, weight_factor: float = 1) -> float:
     """
     Calculates the Fitness Value of the Simulated Data. The smaller the Fitness-Value the better
     :param positions: The actual Positions of the simulated Ball
-    :param setpoints: The desired Positions for the ball
+    :param setpoints: The desired Positions for the ball, or the Scenario which already knows its setpoint changes
     :param weight_factor: The Factor which decides how much weight gets applied to the error of the approaching areas
     :return: Fitness Value of the PID-Controller
     """
     assert weight_factor >= 0
+    setpoints, scenario_setpoint_changes = unpack_scenario(setpoints)
     positions, setpoints = prepare_data(positions, setpoints)
-    setpoint_changes = get_setpoint_changing_points(setpoints)
+    setpoint_changes = get_setpoint_changing_points(setpoints) if scenario_setpoint_changes is None else scenario_setpoint_changes
     positions_diff, positions_abs_diff = get_differentiated_positions(positions)
     intersection_points = get_intersection_points(positions, setpoints, positions_abs_diff, threshold=0.02)
     approaching_areas = get_approaching_areas(setpoints, setpoint_changes, intersection_points)
@@ -22,6 +28,23 @@ def fitness(positions: List[float], setpoints: List[float], weight_factor: float
     return fitness_value
 
 
+def rank_errors(errors: np.ndarray) -> np.ndarray:
+    """
+    :param errors: Fitness Values, NaN / inf for diverged runs
+    :return: The Fitness Values with the ones of diverged runs replaced by inf, so they rank behind every finite one
+    """
+    errors = np.asarray(errors, dtype=float)
+
+    return np.where(np.isfinite(errors), errors, np.inf)
+
+
+def unpack_scenario(setpoints: List[float] | Scenario) -> Tuple[List[float], np.ndarray | None]:
+    if isinstance(setpoints, Scenario):
+        return setpoints.setpoints.tolist(), setpoints.setpoint_changes
+
+    return setpoints, None
+
+
 def prepare_data(positions: List[float], setpoints: List[float]) -> Tuple[np.ndarray, np.ndarray]:
     positions = [0] + positions
     setpoints = [0] + setpoints
@@ -78,12 +101,125 @@ def get_approaching_areas(setpoints: np.ndarray, setpoint_changes: np.ndarray, i
     return approaching_areas
 
 
-def calculate_fitness(positions: np.ndarray, setpoints: np.ndarray, approaching_areas: List[Tuple[int, int]], weight_factor: float) -> float:
+def get_error_weights(setpoints: np.ndarray, approaching_areas: List[Tuple[int, int]], weight_factor: float) -> np.ndarray:
     error_weights = np.ones(len(setpoints))
     for area in approaching_areas:
         error_weights[area[0]:area[1] + 1] = weight_factor
 
+    return error_weights
+
+
+def calculate_fitness(positions: np.ndarray, setpoints: np.ndarray, approaching_areas: List[Tuple[int, int]], weight_factor: float) -> float:
+    error_weights = get_error_weights(setpoints, approaching_areas, weight_factor)
     error_values = error_weights * np.abs(setpoints - positions)
     fitness_value = np.sum(error_values)
 
     return fitness_value
+
+
+def fitness_batch(positions_matrix: np.ndarray, setpoints: List[float] | Scenario, weight_factor: float = 1) -> np.ndarray:
+    """
+    Calculates the Fitness Values of a whole batch of simulated Trajectories in one pass. Gives the same results as
+    calling fitness for every row of the matrix.
+    :param positions_matrix: The actual Positions of the simulated Balls as (N, T) Matrix
+    :param setpoints: The desired Positions for the balls shared by all rows, or the Scenario
+    :param weight_factor: The Factor which decides how much weight gets applied to the error of the approaching areas
+    :return: Fitness Values of the PID-Controllers as Array of shape (N,)
+    """
+    assert weight_factor >= 0
+    setpoints, scenario_setpoint_changes = unpack_scenario(setpoints)
+    positions, setpoints = prepare_batch_data(positions_matrix, setpoints)
+    setpoint_changes = get_setpoint_changing_points(setpoints) if scenario_setpoint_changes is None else scenario_setpoint_changes
+    positions_diff, positions_abs_diff = get_differentiated_positions(positions)
+    intersection_mask = get_intersection_mask(positions, setpoints, positions_abs_diff, threshold=0.02)
+    approaching_area_ends = get_approaching_area_ends(setpoints, setpoint_changes, intersection_mask)
+    fitness_values = calculate_fitness_batch(positions, setpoints, setpoint_changes, approaching_area_ends, weight_factor)
+
+    return fitness_values
+
+
+def prepare_batch_data(positions_matrix: np.ndarray, setpoints: List[float]) -> Tuple[np.ndarray, np.ndarray]:
+    positions_matrix = np.atleast_2d(np.asarray(positions_matrix, dtype=float))
+    positions = np.zeros((positions_matrix.shape[0], positions_matrix.shape[1] + 1))
+    positions[:, 1:] = positions_matrix
+    setpoints = np.concatenate(([0], np.asarray(setpoints, dtype=float)))
+
+    return positions, setpoints
+
+
+def get_intersection_mask(positions: np.ndarray, setpoints: np.ndarray, positions_abs_diff: np.ndarray, threshold: float) -> np.ndarray:
+    setpoint_position_difference = setpoints - positions
+    intersection_mask = (np.multiply(
+        setpoint_position_difference[:, 1:],
+        setpoint_position_difference[:, :-1]
+    ) <= 0) & (positions_abs_diff > threshold)
+
+    return intersection_mask
+
+
+def get_approaching_area_ends(setpoints: np.ndarray, setpoint_changes: np.ndarray, intersection_mask: np.ndarray) -> np.ndarray:
+    num_rows = intersection_mask.shape[0]
+    last_index = len(setpoints) - 1
+
+    # Flatten the intersections of all rows into one sorted Array, so a single searchsorted call finds the next
+    # intersection following every setpoint change of every row. The sentinel lies behind the last row.
+    row_offsets = np.arange(num_rows)[:, np.newaxis] * len(setpoints)
+    rows, columns = np.nonzero(intersection_mask)
+    flat_intersections = np.append(row_offsets[rows, 0] + columns, num_rows * len(setpoints))
+    queries = row_offsets + setpoint_changes[np.newaxis, :] + 1
+    candidates = flat_intersections[np.searchsorted(flat_intersections, queries)]
+    # Only intersections within the same row count, otherwise there is no intersection following the setpoint change
+    next_intersections = np.where(candidates < row_offsets + len(setpoints), candidates - row_offsets, last_index)
+
+    # The next setpoint change is the same for all rows, the last one is followed by the end of the data
+    next_setpoint_changes = np.append(setpoint_changes[1:], last_index)
+
+    return np.minimum(next_intersections, next_setpoint_changes[np.newaxis, :])
+
+
+def calculate_fitness_batch(positions: np.ndarray, setpoints: np.ndarray, setpoint_changes: np.ndarray, approaching_area_ends: np.ndarray, weight_factor: float) -> np.ndarray:
+    num_rows = positions.shape[0]
+
+    # Mark the approaching areas with +1 at their start and -1 behind their end, the running sum covers the areas
+    area_boundaries = np.zeros((num_rows, len(setpoints) + 1), dtype=np.int32)
+    area_boundaries[:, setpoint_changes] += 1
+    np.add.at(area_boundaries, (np.repeat(np.arange(num_rows), len(setpoint_changes)), approaching_area_ends.ravel() + 1), -1)
+    is_approaching = np.cumsum(area_boundaries, axis=1)[:, :-1] > 0
+
+    error_weights = np.where(is_approaching, weight_factor, 1.0)
+    error_values = error_weights * np.abs(setpoints - positions)
+    fitness_values = np.sum(error_values, axis=1)
+
+    return fitness_values
+
+
+def smooth_fitness(positions: List[float], setpoints: List[float] | Scenario, position_gradients: np.ndarray, weight_factor: float = 1, epsilon: float = 0.01) -> Tuple[float, np.ndarray]:
+    """
+    Smoothed variant of the Fitness Value which is differentiable with respect to the gains of the PID-Controller.
+    The absolute error gets replaced by sqrt(error^2 + epsilon^2) - epsilon, which tends to the Fitness Value for
+    small epsilon. The weights of the approaching areas are piecewise constant in the gains and are taken as fixed.
+    :param positions: The actual Positions of the simulated Ball
+    :param setpoints: The desired Positions for the ball
+    :param position_gradients: Derivatives of the Positions with respect to (kp, ki, kd) as (T, 3) Matrix
+    :param weight_factor: The Factor which decides how much weight gets applied to the error of the approaching areas
+    :param epsilon: Smoothing of the absolute error around 0
+    :return: Smoothed Fitness Value, Gradient with respect to (kp, ki, kd)
+    """
+    assert weight_factor >= 0
+    assert epsilon > 0
+    setpoints, scenario_setpoint_changes = unpack_scenario(setpoints)
+    positions, setpoints = prepare_data(list(positions), list(setpoints))
+    setpoint_changes = get_setpoint_changing_points(setpoints) if scenario_setpoint_changes is None else scenario_setpoint_changes
+    positions_diff, positions_abs_diff = get_differentiated_positions(positions)
+    intersection_points = get_intersection_points(positions, setpoints, positions_abs_diff, threshold=0.02)
+    approaching_areas = get_approaching_areas(setpoints, setpoint_changes, intersection_points)
+    error_weights = get_error_weights(setpoints, approaching_areas, weight_factor)
+
+    errors = setpoints - positions
+    smooth_abs_errors = np.sqrt(errors ** 2 + epsilon ** 2)
+    fitness_value = np.sum(error_weights * (smooth_abs_errors - epsilon))
+    # The synthetic 0 in the beginning doesn't depend on the gains
+    error_gradients = -np.vstack((np.zeros(3), position_gradients))
+    fitness_gradient = np.sum((error_weights * errors / smooth_abs_errors)[:, np.newaxis] * error_gradients, axis=0)
+
+    return fitness_value, fitness_gradient
@@ -0,0 +1,46 @@
+class FitnessAccumulator:
+    """
+    Incrementally calculates the Fitness Value while the simulation is running. Once the positions up to a step are
+    known, the weight of all previous steps is known as well, so the accumulated value is exact for the steps seen so
+    far and never decreases. It is therefore a lower bound of the final Fitness Value.
+    """
+    def __init__(self, weight_factor: float = 1, threshold: float = 0.02):
+        assert weight_factor >= 0
+        self.weight_factor = weight_factor
+        self.threshold = threshold
+        self.value = 0.0
+
+        # State of the synthetic 0 which the fitness function inserts in the beginning
+        self.prev_setpoint = 0
+        self.prev_position = 0
+        self.prev_difference = 0
+        self.is_approaching = False
+
+    def add(self, position: float, setpoint: float) -> float:
+        difference = setpoint - position
+
+        # Decide on the weight of the previous step, which is known now that its successor is known
+        if setpoint != self.prev_setpoint:
+            # A setpoint change opens a new approaching area
+            self.is_approaching = True
+            weight = self.weight_factor
+        elif self.is_approaching:
+            weight = self.weight_factor
+            # The first intersection following the setpoint change closes the approaching area
+            if self.prev_difference * difference <= 0 and abs(position - self.prev_position) > self.threshold:
+                self.is_approaching = False
+        else:
+            weight = 1
+        self.value += weight * abs(self.prev_difference)
+
+        self.prev_setpoint = setpoint
+        self.prev_position = position
+        self.prev_difference = difference
+
+        return self.value
+
+    def finish(self) -> float:
+        # An approaching area which is still open lasts until the end of the data
+        weight = self.weight_factor if self.is_approaching else 1
+
+        return self.value + weight * abs(self.prev_difference)
@@ -0,0 +1,128 @@
+from typing import Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from src.genetic.fitness import rank_errors
+from src.genetic.population import Population
+
+if TYPE_CHECKING:
+    from src.evaluation import Evaluator
+
+
+class GeneticOptimizer:
+    """
+    Genetic algorithm which tunes the gains of a PID-Controller. Every generation gets evaluated, the best genomes get
+    selected as parents, their children get bred by crossover and some of them get mutated.
+
+    The population is stored in Arrays and evaluated as a whole by the Evaluator, so the backend (serial, process pool
+    or lockstep batch) can be chosen freely. While an asynchronous backend evaluates a generation, the bookkeeping of
+    the previous generation runs in parallel.
+    """
+    def __init__(
+            self,
+            evaluator: 'Evaluator',
+            population_size: int = 120,
+            selection_size: int = 30,
+            crossover_rate: int = 8,
+            mutation_probability: float = 0.2,
+            mutation_impact: float = 5,
+            p_bounds: Tuple[float, float] = (-30, 30),
+            i_bounds: Tuple[float, float] = (-1, 1),
+            d_bounds: Tuple[float, float] = (-300, 300),
+            seed: int | None = None):
+        assert selection_size % 2 == 0
+        self.evaluator = evaluator
+        self.population_size = population_size
+        self.selection_size = selection_size
+        self.crossover_rate = crossover_rate
+        self.mutation_probability = mutation_probability
+        self.mutation_impact = mutation_impact
+        self.bounds = np.array([p_bounds, i_bounds, d_bounds], dtype=float)
+        self.rng = np.random.default_rng(seed)
+
+        self.next_id = 1
+        self.history = []
+        self.best_fitness = None
+        self.best_gains = None
+
+    def generate_ids(self, num_ids: int) -> np.ndarray:
+        ids = np.arange(self.next_id, self.next_id + num_ids)
+        self.next_id += num_ids
+
+        return ids
+
+    def generate_population(self) -> Population:
+        gains = self.rng.uniform(self.bounds[:, 0], self.bounds[:, 1], (self.population_size, 3))
+
+        return Population.create(self.generate_ids(self.population_size), gains, np.ones(self.population_size))
+
+    def select_genomes(self, population: Population) -> Population:
+        indices_of_smallest_error = np.argsort(rank_errors(population.fitness), kind='stable')[:self.selection_size]
+        population.got_killed[indices_of_smallest_error] = False
+
+        return population[indices_of_smallest_error]
+
+    def crossover(self, parents: Population) -> Population:
+        mothers, fathers = parents.gains[0::2], parents.gains[1::2]
+        means = (mothers + fathers) / 2
+        std_devs = np.abs(mothers - means)
+
+        # Every pair of parents gets crossover_rate children, normally distributed around the mean of the parents
+        children_gains = self.rng.normal(
+            np.repeat(means, self.crossover_rate, axis=0),
+            np.repeat(std_devs, self.crossover_rate, axis=0)
+        )
+        generations = np.repeat(parents.generations[0::2] + 1, self.crossover_rate)
+
+        return Population.create(self.generate_ids(len(children_gains)), children_gains, generations)
+
+    def mutate(self, children: Population) -> Population:
+        means = np.mean(children.gains, axis=0)
+        std_devs = np.std(children.gains, axis=0)
+
+        is_mutated = self.rng.uniform(0, 1, len(children)) < self.mutation_probability
+        mutated = children.copy()
+        mutated.gains[is_mutated] = self.rng.normal(means, std_devs * self.mutation_impact, (int(np.sum(is_mutated)), 3))
+        mutated.is_mutated = is_mutated
+
+        return mutated
+
+    def record(self, population: Population, verbose: bool):
+        self.history.append(population)
+        if np.all(np.isnan(population.fitness)):
+            return
+        best_idx = int(np.nanargmin(population.fitness))
+        if self.best_fitness is None or population.fitness[best_idx] < self.best_fitness:
+            self.best_fitness = float(population.fitness[best_idx])
+            self.best_gains = population.gains[best_idx].copy()
+        if verbose:
+            print(f'Min. Error: {population.fitness[best_idx]}')
+
+    def run(self, num_generations: int, verbose: bool = False) -> Tuple[np.ndarray, float]:
+        """
+        Runs the genetic algorithm
+        :param num_generations: Number of generations to evaluate
+        :param verbose: Print the smallest error of every generation
+        :return: Best (kp, ki, kd) combination, Error
+        """
+        population = self.generate_population()
+        previous_population = None
+        for generation in range(num_generations):
+            pending_evaluation = self.evaluator.evaluate_async(population.gains)
+
+            # Record the previous generation while the current one gets evaluated
+            if previous_population is not None:
+                self.record(previous_population, verbose)
+            population.fitness = pending_evaluation.get()
+            previous_population = population
+
+            if generation < num_generations - 1:
+                parents = self.select_genomes(population)
+                children = self.crossover(parents)
+                population = self.mutate(children)
+        self.record(previous_population, verbose)
+
+        return self.best_gains, self.best_fitness
+
+    def all_genomes(self) -> Population:
+        return Population.concatenate(self.history)
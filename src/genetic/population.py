@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class Population:
+    """
+    Array-backed population of genomes. Every attribute of a genome is stored in one Array, row n of all Arrays
+    belongs to the same genome.
+    """
+    ids: np.ndarray
+    gains: np.ndarray
+    generations: np.ndarray
+    fitness: np.ndarray
+    is_mutated: np.ndarray
+    got_killed: np.ndarray
+
+    @staticmethod
+    def create(ids: np.ndarray, gains: np.ndarray, generations: np.ndarray) -> 'Population':
+        return Population(
+            ids=np.asarray(ids, dtype=np.int64),
+            gains=np.asarray(gains, dtype=float).reshape(-1, 3),
+            generations=np.asarray(generations, dtype=np.int32),
+            fitness=np.zeros(len(ids)),
+            is_mutated=np.zeros(len(ids), dtype=bool),
+            got_killed=np.ones(len(ids), dtype=bool)
+        )
+
+    @staticmethod
+    def concatenate(populations: list['Population']) -> 'Population':
+        return Population(*(np.concatenate([getattr(population, field) for population in populations]) for field in Population.__dataclass_fields__))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, indices) -> 'Population':
+        return Population(*(getattr(self, field)[indices] for field in Population.__dataclass_fields__))
+
+    @property
+    def p(self) -> np.ndarray:
+        return self.gains[:, 0]
+
+    @property
+    def i(self) -> np.ndarray:
+        return self.gains[:, 1]
+
+    @property
+    def d(self) -> np.ndarray:
+        return self.gains[:, 2]
+
+    def copy(self) -> 'Population':
+        return Population(*(getattr(self, field).copy() for field in Population.__dataclass_fields__))
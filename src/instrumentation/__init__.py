@@ -0,0 +1,2 @@
+from .instrumentation import Instrumentation
+from .sweepprogress import SweepProgress
@@ -0,0 +1,133 @@
+import functools
+import importlib
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Dict, Tuple, Callable, ContextManager
+
+
+class Instrumentation:
+    """
+    Opt-in timers and counters of the hot paths. Nothing is instrumented until enable gets called: enable wraps the
+    functions of PROBES with timers and disable restores the originals, so disabled instrumentation costs nothing.
+    Explicit timers and counters, e.g. in the visualization loop, are a single flag check while disabled.
+
+    The timings are inclusive, e.g. agent.run contains the time of simulation.next. Every process collects its own
+    stats, workers send them to the parent which merges them.
+    """
+    # (module, class or None for module-level functions, attribute, name of the stat)
+    PROBES = (
+        ('src.simulation.simulation', 'Simulation', 'next', 'simulation.next'),
+        ('src.simulation.batchsimulation', 'BatchSimulation', 'next', 'batch_simulation.next'),
+        ('src.pid.pidcontroller', 'PIDController', 'next', 'pid.next'),
+        ('src.pid.batchpidcontroller', 'BatchPIDController', 'next', 'batch_pid.next'),
+        ('src.genetic.fitness', None, 'prepare_data', 'fitness.prepare_data'),
+        ('src.genetic.fitness', None, 'get_setpoint_changing_points', 'fitness.get_setpoint_changing_points'),
+        ('src.genetic.fitness', None, 'get_differentiated_positions', 'fitness.get_differentiated_positions'),
+        ('src.genetic.fitness', None, 'get_intersection_points', 'fitness.get_intersection_points'),
+        ('src.genetic.fitness', None, 'get_approaching_areas', 'fitness.get_approaching_areas'),
+        ('src.genetic.fitness', None, 'calculate_fitness', 'fitness.calculate_fitness'),
+        ('src.genetic.fitness', None, 'prepare_batch_data', 'fitness_batch.prepare_batch_data'),
+        ('src.genetic.fitness', None, 'get_intersection_mask', 'fitness_batch.get_intersection_mask'),
+        ('src.genetic.fitness', None, 'get_approaching_area_ends', 'fitness_batch.get_approaching_area_ends'),
+        ('src.genetic.fitness', None, 'calculate_fitness_batch', 'fitness_batch.calculate_fitness_batch'),
+        ('src.bruteforce.bruteforceagent', 'BruteForceAgent', 'run', 'agent.run'),
+        ('src.bruteforce.batchbruteforceagent', 'BatchBruteForceAgent', 'run', 'batch_agent.run'),
+    )
+
+    enabled = False
+    _disabled_timer = nullcontext()
+    # Name of the stat -> [count, seconds]
+    stats: Dict[str, list] = {}
+    _originals: Dict[Tuple[object, str], Callable] = {}
+
+    @staticmethod
+    def enable():
+        if Instrumentation.enabled:
+            return
+        for module_name, class_name, attribute, name in Instrumentation.PROBES:
+            owner = importlib.import_module(module_name)
+            if class_name is not None:
+                owner = getattr(owner, class_name)
+            original = owner.__dict__[attribute] if isinstance(owner, type) else getattr(owner, attribute)
+            Instrumentation._originals[(owner, attribute)] = original
+            setattr(owner, attribute, Instrumentation.wrap(original, name))
+        Instrumentation.enabled = True
+
+    @staticmethod
+    def disable():
+        for (owner, attribute), original in Instrumentation._originals.items():
+            setattr(owner, attribute, original)
+        Instrumentation._originals = {}
+        Instrumentation.enabled = False
+
+    @staticmethod
+    def wrap(fun: Callable, name: str) -> Callable:
+        @functools.wraps(fun)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return fun(*args, **kwargs)
+            finally:
+                Instrumentation.add(name, perf_counter() - start)
+
+        return timed
+
+    @staticmethod
+    def add(name: str, seconds: float, count: int = 1):
+        stat = Instrumentation.stats.get(name)
+        if stat is None:
+            Instrumentation.stats[name] = [count, seconds]
+        else:
+            stat[0] += count
+            stat[1] += seconds
+
+    @staticmethod
+    def count(name: str, count: int = 1):
+        if Instrumentation.enabled:
+            Instrumentation.add(name, 0.0, count)
+
+    @staticmethod
+    def timer(name: str) -> ContextManager:
+        """
+        Times a block, e.g.
+            with Instrumentation.timer('visualization.render'):
+                ...
+        """
+        return Instrumentation._timer(name) if Instrumentation.enabled else Instrumentation._disabled_timer
+
+    @staticmethod
+    @contextmanager
+    def _timer(name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            Instrumentation.add(name, perf_counter() - start)
+
+    @staticmethod
+    def collect() -> Dict[str, list]:
+        """
+        :return: The stats collected since the last call, e.g. to send them from a worker to the parent
+        """
+        stats = Instrumentation.stats
+        Instrumentation.stats = {}
+
+        return stats
+
+    @staticmethod
+    def merge(stats: Dict[str, list]):
+        for name, (count, seconds) in stats.items():
+            Instrumentation.add(name, seconds, count)
+
+    @staticmethod
+    def reset():
+        Instrumentation.stats = {}
+
+    @staticmethod
+    def report() -> str:
+        lines = [f'{"stat":<44} {"count":>12} {"total s":>10} {"mean us":>10}']
+        for name, (count, seconds) in sorted(Instrumentation.stats.items(), key=lambda item: -item[1][1]):
+            mean = f'{seconds / count * 1e6:>10.2f}' if seconds > 0 else f'{"":>10}'
+            lines.append(f'{name:<44} {count:>12,} {seconds:>10.3f} {mean}')
+
+        return '\n'.join(lines)
@@ -0,0 +1,86 @@
+import sys
+import time
+from typing import Dict, TextIO
+
+import numpy as np
+
+
+class SweepProgress:
+    """
+    Live progress of a sweep: throughput, ETA, best error so far and the utilization of every worker, which is the
+    share of the elapsed time the worker spent evaluating. Gets printed at most every interval seconds.
+    """
+    def __init__(self, interval: float = 1.0, output: TextIO | None = None):
+        self.interval = interval
+        self.output = output
+        self.total = 0
+        self.done = 0
+        self.best_error = np.inf
+        self.busy_seconds: Dict[int, float] = {}
+        self.start_time = None
+        self.last_print = 0.0
+
+    def start(self, total: int):
+        self.total = total
+        self.done = 0
+        self.best_error = np.inf
+        self.busy_seconds = {}
+        self.start_time = time.perf_counter()
+        self.last_print = self.start_time
+
+    def update(self, worker: int, evaluations: int, seconds: float, best_error: float):
+        """
+        :param worker: Id of the worker which finished the chunk, e.g. its pid
+        :param evaluations: Number of evaluated candidates of the chunk
+        :param seconds: Time the worker spent on the chunk
+        :param best_error: Smallest error of the chunk
+        """
+        self.done += evaluations
+        self.busy_seconds[worker] = self.busy_seconds.get(worker, 0.0) + seconds
+        if best_error < self.best_error:
+            self.best_error = best_error
+
+        now = time.perf_counter()
+        if now - self.last_print >= self.interval:
+            self.last_print = now
+            self.print()
+
+    def finish(self):
+        self.print()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start_time
+
+    @property
+    def throughput(self) -> float:
+        """
+        :return: Evaluations per second
+        """
+        return self.done / max(self.elapsed, 1e-9)
+
+    @property
+    def eta(self) -> float:
+        """
+        :return: Estimated seconds until the sweep is finished
+        """
+        return (self.total - self.done) / self.throughput if self.done else np.inf
+
+    def utilization(self) -> Dict[int, float]:
+        elapsed = max(self.elapsed, 1e-9)
+
+        return {worker: seconds / elapsed for worker, seconds in sorted(self.busy_seconds.items())}
+
+    def format(self) -> str:
+        utilization = ' '.join(f'{share:.0%}' for share in self.utilization().values())
+
+        return (
+            f'{self.done:,}/{self.total:,} ({self.done / max(self.total, 1):.1%})  '
+            f'{self.throughput:,.0f} evaluations/s  '
+            f'ETA {self.eta:.0f}s  '
+            f'best {self.best_error:.4g}  '
+            f'workers [{utilization}]'
+        )
+
+    def print(self):
+        print(self.format(), file=self.output or sys.stdout, flush=True)
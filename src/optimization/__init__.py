@@ -0,0 +1,32 @@
+"""
+Most optimizers depend on scipy, the classes only get imported on first access (PEP 562).
+"""
+import importlib
+
+# Exported name -> module which defines it
+_EXPORTS = {
+    'GradientOptimizer': '.gradientoptimizer',
+    'GaussianProcess': '.gaussianprocess',
+    'SurrogateOptimizer': '.surrogateoptimizer',
+    'StartResult': '.startresult',
+    'SharedIncumbents': '.sharedincumbents',
+    'MultiStartOptimizer': '.multistartoptimizer',
+    'SuccessiveHalving': '.successivehalving',
+    'LandscapeSlice': '.landscapeslice',
+    'CostLandscape': '.costlandscape'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
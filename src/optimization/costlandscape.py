@@ -0,0 +1,108 @@
+from typing import Sequence, Tuple, Dict
+
+import numpy as np
+
+from src.evaluation import Evaluator, CachedEvaluator
+from src.optimization.landscapeslice import LandscapeSlice
+
+
+class CostLandscape:
+    """
+    Sections through the cost landscape around a base (kp, ki, kd) combination: 1-D slices along one gain and 2-D
+    heatmaps over two gains. All points of a request get evaluated as one batch by the Evaluator, e.g. a BatchEvaluator
+    or a PoolEvaluator, and are shared through a CachedEvaluator.
+
+    The grid points are placed so that refining a slice reproduces its points exactly, only the new points in between
+    get simulated. Overlapping slices and heatmaps share their points as well.
+    """
+    AXES = ('p', 'i', 'd')
+
+    def __init__(self, evaluator: Evaluator, base_gains: Sequence[float]):
+        self.evaluator = evaluator if isinstance(evaluator, CachedEvaluator) else CachedEvaluator(evaluator)
+        self.base_gains = np.asarray(base_gains, dtype=float)
+        assert self.base_gains.shape == (3,)
+
+    @staticmethod
+    def axis_index(axis: int | str) -> int:
+        return CostLandscape.AXES.index(axis) if isinstance(axis, str) else axis
+
+    @staticmethod
+    def coordinates(low: float, high: float, resolution: int) -> np.ndarray:
+        # k / (n - 1) is rounded the same way for every refinement, so refined grids contain the coarse points exactly
+        assert resolution >= 2
+
+        return low + (high - low) * (np.arange(resolution) / (resolution - 1))
+
+    def slice(self, axis: int | str, low: float, high: float, resolution: int = 101) -> LandscapeSlice:
+        """
+        Varies one gain while the other two stay at the base gains
+        :param axis: 'p', 'i', 'd' or the index of the gain
+        :param resolution: Number of points between low and high, both included
+        """
+        return self.section((axis,), ((low, high),), (resolution,))
+
+    def profiles(self, bounds: Dict[int | str, Tuple[float, float]], resolution: int = 101) -> Dict[int | str, LandscapeSlice]:
+        """
+        Computes the 1-D slices of several gains as one batch, e.g.
+            landscape.profiles({'p': (-10, 10), 'i': (-10, 10), 'd': (-300, 0)}, resolution=1001)
+        :return: The slices by their axis
+        """
+        gains = [self.section_gains((axis,), (axis_bounds,), (resolution,))[1] for axis, axis_bounds in bounds.items()]
+        errors = self.evaluator.evaluate(np.concatenate(gains)).reshape(len(bounds), resolution)
+
+        return {
+            axis: LandscapeSlice(
+                self.base_gains.copy(),
+                (self.axis_index(axis),),
+                (tuple(axis_bounds),),
+                (resolution,),
+                [self.coordinates(*axis_bounds, resolution)],
+                axis_errors
+            )
+            for (axis, axis_bounds), axis_errors in zip(bounds.items(), errors)
+        }
+
+    def heatmap(self, axes: Tuple[int | str, int | str], bounds: Tuple[Tuple[float, float], Tuple[float, float]], resolution: Tuple[int, int] = (51, 51)) -> LandscapeSlice:
+        """
+        Varies two gains while the third one stays at the base gains
+        :return: Slice whose errors have the shape resolution, the first axis belongs to the first gain
+        """
+        return self.section(axes, bounds, resolution)
+
+    def refine(self, landscape_slice: LandscapeSlice, factor: int = 2) -> LandscapeSlice:
+        """
+        Recomputes a slice or heatmap with factor times smaller spacing, only the new points get simulated
+        """
+        assert factor >= 1
+        resolution = tuple((points - 1) * factor + 1 for points in landscape_slice.resolution)
+
+        return self.section(landscape_slice.axes, landscape_slice.bounds, resolution)
+
+    def section(self, axes: Tuple[int | str, ...], bounds: Tuple[Tuple[float, float], ...], resolution: Tuple[int, ...]) -> LandscapeSlice:
+        coordinates, gains = self.section_gains(axes, bounds, resolution)
+        errors = self.evaluator.evaluate(gains).reshape(resolution)
+
+        return LandscapeSlice(
+            self.base_gains.copy(),
+            tuple(self.axis_index(axis) for axis in axes),
+            tuple(tuple(axis_bounds) for axis_bounds in bounds),
+            tuple(resolution),
+            coordinates,
+            errors
+        )
+
+    def section_gains(self, axes: Tuple[int | str, ...], bounds: Tuple[Tuple[float, float], ...], resolution: Tuple[int, ...]):
+        """
+        :return: The coordinates along every axis and the (kp, ki, kd) combinations of all points as (N, 3) Matrix in
+        the order of np.meshgrid with indexing='ij'
+        """
+        assert len(axes) == len(bounds) == len(resolution)
+        axis_indices = [self.axis_index(axis) for axis in axes]
+        assert len(set(axis_indices)) == len(axis_indices)
+        coordinates = [self.coordinates(low, high, points) for (low, high), points in zip(bounds, resolution)]
+
+        gains = np.tile(self.base_gains, (int(np.prod(resolution)), 1))
+        for axis_index, grid in zip(axis_indices, np.meshgrid(*coordinates, indexing='ij')):
+            gains[:, axis_index] = grid.ravel()
+
+        return coordinates, gains
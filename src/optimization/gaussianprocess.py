@@ -0,0 +1,65 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+
+
+class GaussianProcess:
+    """
+    Gaussian-process regression with a Matern 5/2 kernel on inputs scaled to the unit cube. The length scale is chosen
+    from a set of candidates by maximizing the log marginal likelihood.
+    """
+    def __init__(self, length_scales: Sequence[float] = (0.05, 0.1, 0.2, 0.3, 0.5, 0.8), noise: float = 1e-6):
+        self.length_scales = length_scales
+        self.noise = noise
+        self.length_scale = None
+        self.x = None
+        self.y_mean = 0.0
+        self.y_std = 1.0
+        self.factor = None
+        self.alpha = None
+
+    def kernel(self, x1: np.ndarray, x2: np.ndarray, length_scale: float) -> np.ndarray:
+        distances = np.sqrt(np.maximum(np.sum((x1[:, np.newaxis, :] - x2[np.newaxis, :, :]) ** 2, axis=2), 0)) / length_scale
+        scaled = np.sqrt(5) * distances
+
+        return (1 + scaled + scaled ** 2 / 3) * np.exp(-scaled)
+
+    def fit(self, x: np.ndarray, y: np.ndarray, length_scale: float | None = None) -> 'GaussianProcess':
+        """
+        :param x: Inputs as (N, D) Matrix, scaled to the unit cube
+        :param y: Targets of shape (N,)
+        :param length_scale: Fixed length scale, otherwise it gets chosen by the marginal likelihood
+        """
+        self.x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.y_mean = np.mean(y)
+        self.y_std = np.std(y) or 1.0
+        normalized_y = (y - self.y_mean) / self.y_std
+
+        best_likelihood = None
+        for candidate in ([length_scale] if length_scale is not None else self.length_scales):
+            covariance = self.kernel(self.x, self.x, candidate) + self.noise * np.eye(len(self.x))
+            try:
+                factor = cho_factor(covariance, lower=True)
+            except np.linalg.LinAlgError:
+                continue
+            alpha = cho_solve(factor, normalized_y)
+            likelihood = -0.5 * normalized_y @ alpha - np.sum(np.log(np.diag(factor[0])))
+            if best_likelihood is None or likelihood > best_likelihood:
+                best_likelihood = likelihood
+                self.length_scale, self.factor, self.alpha = candidate, factor, alpha
+        if best_likelihood is None:
+            raise np.linalg.LinAlgError('Covariance matrix is not positive definite for any length scale')
+
+        return self
+
+    def predict(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: Predicted mean and standard deviation
+        """
+        cross_covariance = self.kernel(np.asarray(x, dtype=float), self.x, self.length_scale)
+        mean = cross_covariance @ self.alpha
+        variance = 1 - np.sum(cross_covariance * cho_solve(self.factor, cross_covariance.T).T, axis=1)
+
+        return self.y_mean + self.y_std * mean, self.y_std * np.sqrt(np.maximum(variance, 1e-12))
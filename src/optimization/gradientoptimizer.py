@@ -0,0 +1,115 @@
+from typing import List, Tuple, Sequence
+
+import numpy as np
+from scipy.optimize import minimize, OptimizeResult
+
+from src.genetic import fitness, smooth_fitness
+from src.simulation import SensitivitySimulation
+from src.pid import SensitivityPIDController
+
+
+class GradientOptimizer:
+    """
+    Gradient-based tuner for the gains of a PID-Controller. The positions get simulated together with their derivatives
+    with respect to (kp, ki, kd), which gives the value and the gradient of the smoothed fitness function in one
+    simulation, so quasi-Newton methods like L-BFGS-B can be used instead of Powell.
+    """
+    def __init__(
+            self,
+            mass: float,
+            delta_t: float,
+            setpoints: List[float],
+            external_force: List[float],
+            weight_factor: float,
+            epsilon: float = 0.01,
+            clamp_gradient: float = 0.0):
+        """
+        :param epsilon: Smoothing of the absolute error of the fitness function
+        :param clamp_gradient: Share of the gradient which leaks through an active angle clamp, see SensitivitySimulation
+        """
+        self.mass = mass
+        self.delta_t = delta_t
+        self.setpoints = setpoints
+        self.external_force = external_force
+        self.weight_factor = weight_factor
+        self.epsilon = epsilon
+        self.clamp_gradient = clamp_gradient
+        self.num_evaluations = 0
+
+    def simulate(self, gains: Sequence[float]) -> Tuple[List[float], np.ndarray]:
+        """
+        :return: Positions, Derivatives of the positions with respect to (kp, ki, kd) as (T, 3) Matrix
+        """
+        kp, ki, kd = gains
+        simulation = SensitivitySimulation(mass=self.mass, delta_t=self.delta_t, clamp_gradient=self.clamp_gradient)
+        pid_controller = SensitivityPIDController(kp, ki, kd, self.setpoints[0])
+
+        positions = []
+        position_gradients = np.empty((len(self.setpoints), 3))
+        position = 0
+        position_gradient = np.zeros(3)
+        for idx, setpoint in enumerate(self.setpoints):
+            pid_controller.setpoint = setpoint
+            new_angle, new_angle_gradient = pid_controller.next_with_gradient(position, position_gradient)
+            _, _, position, position_gradient = simulation.next_with_gradient(new_angle, new_angle_gradient, self.external_force[idx])
+            positions.append(position)
+            position_gradients[idx] = position_gradient
+
+        return positions, position_gradients
+
+    def value_and_gradient(self, gains: Sequence[float]) -> Tuple[float, np.ndarray]:
+        """
+        :return: Smoothed Fitness Value, Gradient with respect to (kp, ki, kd)
+        """
+        self.num_evaluations += 1
+        positions, position_gradients = self.simulate(gains)
+
+        return smooth_fitness(positions, self.setpoints, position_gradients, self.weight_factor, self.epsilon)
+
+    def error(self, gains: Sequence[float]) -> float:
+        positions, _ = self.simulate(gains)
+
+        return fitness(positions, self.setpoints, self.weight_factor)
+
+    def minimize(
+            self,
+            initial_guess: Sequence[float],
+            method: str = 'L-BFGS-B',
+            bounds: Sequence[Tuple[float, float]] | None = None,
+            scale: Sequence[float] | None = None,
+            options: dict | None = None,
+            callback=None) -> OptimizeResult:
+        """
+        Minimizes the smoothed fitness function with a gradient-based method of scipy.optimize.minimize
+        :param initial_guess: Start (kp, ki, kd)
+        :param bounds: Optional (min, max) of kp, ki and kd
+        :param scale: Typical magnitude of kp, ki and kd. The gains differ by orders of magnitude, so the optimizer
+        works on the gains divided by the scale. Defaults to the magnitude of the initial guess
+        :return: The result of scipy with x in the original units and the unsmoothed fitness value as error
+        """
+        initial_guess = np.asarray(initial_guess, dtype=float)
+        if scale is None:
+            scale = np.where(initial_guess != 0, np.abs(initial_guess), 1.0)
+        scale = np.asarray(scale, dtype=float)
+
+        def scaled_value_and_gradient(scaled_gains: np.ndarray) -> Tuple[float, np.ndarray]:
+            value, gradient = self.value_and_gradient(scaled_gains * scale)
+
+            return value, gradient * scale
+
+        scaled_bounds = None if bounds is None else [tuple(np.sort(np.asarray(bound) / s)) for bound, s in zip(bounds, scale)]
+        self.num_evaluations = 0
+        result = minimize(
+            fun=scaled_value_and_gradient,
+            x0=initial_guess / scale,
+            jac=True,
+            method=method,
+            bounds=scaled_bounds,
+            options=options,
+            callback=callback
+        )
+        result.x = result.x * scale
+        result.jac = result.jac / scale
+        result.error = self.error(result.x)
+
+        return result
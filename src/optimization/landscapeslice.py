@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from typing import Tuple, List
+
+import numpy as np
+
+
+@dataclass
+class LandscapeSlice:
+    """
+    1-D or 2-D section through the cost landscape. All gains except the ones of the sliced axes stay at base_gains.
+    errors has one dimension per sliced axis, indexed like coordinates.
+    """
+    base_gains: np.ndarray
+    axes: Tuple[int, ...]
+    bounds: Tuple[Tuple[float, float], ...]
+    resolution: Tuple[int, ...]
+    coordinates: List[np.ndarray]
+    errors: np.ndarray
+
+    @property
+    def best_gains(self) -> np.ndarray:
+        """
+        :return: The (kp, ki, kd) combination of the slice with the smallest error
+        """
+        best = np.unravel_index(np.nanargmin(self.errors), self.errors.shape)
+        gains = np.array(self.base_gains, dtype=float)
+        for axis, values, idx in zip(self.axes, self.coordinates, best):
+            gains[axis] = values[idx]
+
+        return gains
@@ -0,0 +1,145 @@
+import multiprocessing
+from typing import List, Tuple, Sequence
+
+import numpy as np
+from scipy.optimize import minimize
+
+from src.bruteforce import SharedBound
+from src.evaluation import Evaluator
+from src.optimization.startresult import StartResult
+from src.optimization.sharedincumbents import SharedIncumbents
+
+
+class DominatedStart(Exception):
+    pass
+
+
+class DuplicateStart(Exception):
+    pass
+
+
+class MultiStartOptimizer:
+    """
+    Runs many local optimizations (Powell by default) from different starts in parallel on a multiprocessing.Pool.
+    All runs share the best error found so far through a SharedBound. A run which is still far behind it after its
+    patience is used up gets stopped. The incumbents of all runs get shared through SharedIncumbents as well, a run
+    whose incumbent comes within the basin_tolerance of a better run's incumbent is a duplicate of that run and gets
+    stopped right away. In the end the runs which reached the same basin get grouped together.
+
+    The evaluator gets sent to every worker once and is used inside the worker, so it has to evaluate in-process, e.g.
+    a SerialEvaluator or a CachedEvaluator with an on-disk tier that all workers share.
+    """
+    _worker_state = None
+
+    def __init__(
+            self,
+            evaluator: Evaluator,
+            bounds: Sequence[Tuple[float, float]],
+            num_starts: int = 16,
+            initial_guesses: Sequence[Sequence[float]] = (),
+            method: str = 'Powell',
+            options: dict | None = None,
+            num_workers: int | None = None,
+            patience: int = 200,
+            dominance_margin: float = 0.5,
+            basin_tolerance: float = 0.02,
+            seed: int | None = None):
+        """
+        :param bounds: (min, max) of kp, ki and kd, the random starts get drawn from them
+        :param num_starts: Number of starts in total, including the initial guesses
+        :param initial_guesses: Hand-picked starts, e.g. the result of an earlier run
+        :param patience: Number of evaluations a run gets before it can be stopped
+        :param dominance_margin: A run gets stopped if its best error exceeds the global best by this relative margin
+        :param basin_tolerance: Distance within the scaled gain space at which two incumbents count as the same basin
+        """
+        self.evaluator = evaluator
+        self.bounds = np.asarray(bounds, dtype=float)
+        self.num_starts = num_starts
+        self.initial_guesses = np.asarray(initial_guesses, dtype=float).reshape(-1, 3)
+        self.method = method
+        self.options = options
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        self.patience = patience
+        self.dominance_margin = dominance_margin
+        self.basin_tolerance = basin_tolerance
+        self.rng = np.random.default_rng(seed)
+
+    def starts(self) -> np.ndarray:
+        num_random = max(self.num_starts - len(self.initial_guesses), 0)
+        strata = np.array([self.rng.permutation(num_random) for _ in range(3)]).T
+        random_starts = self.bounds[:, 0] + (strata + self.rng.uniform(size=(num_random, 3))) / max(num_random, 1) * (self.bounds[:, 1] - self.bounds[:, 0])
+
+        return np.vstack((self.initial_guesses, random_starts))[:self.num_starts]
+
+    def run(self) -> List[StartResult]:
+        """
+        Runs all starts
+        :return: Results of all starts, sorted by error. Runs within the same basin share the basin number
+        """
+        starts = self.starts()
+        bound = SharedBound()
+        incumbents = SharedIncumbents(len(starts))
+        scale = self.bounds[:, 1] - self.bounds[:, 0]
+        worker_args = (self.evaluator, bound, incumbents, scale, self.method, self.options, self.patience, self.dominance_margin, self.basin_tolerance)
+        with multiprocessing.Pool(self.num_workers, initializer=MultiStartOptimizer.initialize_worker, initargs=worker_args) as pool:
+            results = pool.starmap(MultiStartOptimizer.optimize, enumerate(starts), chunksize=1)
+
+        results = sorted(results, key=lambda result: result.error if np.isfinite(result.error) else np.inf)
+        self.assign_basins(results)
+
+        return results
+
+    def assign_basins(self, results: List[StartResult]):
+        # Every result joins the basin of the first better result within the tolerance, otherwise it opens a new one
+        scale = self.bounds[:, 1] - self.bounds[:, 0]
+        representatives = []
+        for result in results:
+            for basin, representative in enumerate(representatives):
+                if np.linalg.norm((result.x - representative.x) / scale) <= self.basin_tolerance:
+                    result.basin = basin
+                    break
+            else:
+                result.basin = len(representatives)
+                representatives.append(result)
+
+    @staticmethod
+    def initialize_worker(evaluator: Evaluator, bound: SharedBound, incumbents: SharedIncumbents, scale: np.ndarray, method: str, options: dict | None, patience: int, dominance_margin: float, basin_tolerance: float):
+        MultiStartOptimizer._worker_state = (evaluator, bound, incumbents, scale, method, options, patience, dominance_margin, basin_tolerance)
+
+    @staticmethod
+    def optimize(run: int, start: np.ndarray) -> StartResult:
+        evaluator, bound, incumbents, scale, method, options, patience, dominance_margin, basin_tolerance = MultiStartOptimizer._worker_state
+        best = {'x': start, 'error': np.inf, 'num_evaluations': 0}
+
+        def cost_function(gains: np.ndarray) -> float:
+            error = evaluator(gains)
+            best['num_evaluations'] += 1
+            if error < best['error']:
+                best['x'], best['error'] = np.array(gains, dtype=float), error
+                bound.update(error)
+                incumbents.update(run, best['x'], error)
+            # Stop runs which reached the basin of a better run, they would only find the same minimum again
+            if incumbents.better_run(run, best['x'], best['error'], scale, basin_tolerance) is not None:
+                raise DuplicateStart()
+            # Stop runs which lag far behind the best run once their patience is used up
+            if best['num_evaluations'] >= patience and best['error'] > bound.cutoff * (1 + dominance_margin):
+                raise DominatedStart()
+
+            return error if np.isfinite(error) else np.finfo(float).max
+
+        is_dominated = is_duplicate = False
+        try:
+            minimize(fun=cost_function, x0=start, method=method, options=options)
+        except DominatedStart:
+            is_dominated = True
+        except DuplicateStart:
+            is_duplicate = True
+
+        return StartResult(
+            start=start,
+            x=best['x'],
+            error=float(best['error']),
+            num_evaluations=best['num_evaluations'],
+            is_dominated=is_dominated,
+            is_duplicate=is_duplicate
+        )
@@ -0,0 +1,34 @@
+import multiprocessing
+from math import inf
+
+import numpy as np
+
+
+class SharedIncumbents:
+    """
+    Best gains and error found so far by every run of a MultiStartOptimizer, shared between the workers of a
+    multiprocessing.Pool. Like a SharedBound it has to be handed to the workers on creation of the pool. Runs look up
+    whether another run already found a better incumbent in the same basin and stop early if so.
+    """
+    def __init__(self, num_runs: int):
+        # One row of kp, ki, kd, error per run
+        self.values = multiprocessing.Array('d', [0.0, 0.0, 0.0, inf] * num_runs)
+
+    def update(self, run: int, x: np.ndarray, error: float):
+        with self.values.get_lock():
+            self.values[4 * run:4 * run + 4] = [*np.asarray(x, dtype=float).tolist(), error]
+
+    def better_run(self, run: int, x: np.ndarray, error: float, scale: np.ndarray, tolerance: float) -> int | None:
+        """
+        :param scale: Ranges of kp, ki and kd, distances get measured in the gain space scaled by them
+        :param tolerance: Distance at which two incumbents count as the same basin
+        :return: Another run whose incumbent lies within the tolerance and is better, or None. Equal errors go to the
+        run with the lower index, so two runs never stop each other
+        """
+        with self.values.get_lock():
+            incumbents = np.frombuffer(self.values.get_obj()).reshape(-1, 4).copy()
+        distances = np.linalg.norm((incumbents[:, :3] - x) / scale, axis=1)
+        is_better = (incumbents[:, 3] < error) | ((incumbents[:, 3] == error) & (np.arange(len(incumbents)) < run))
+        candidates = np.flatnonzero(is_better & np.isfinite(incumbents[:, 3]) & (distances <= tolerance) & (np.arange(len(incumbents)) != run))
+
+        return int(candidates[0]) if len(candidates) else None
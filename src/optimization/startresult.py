@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class StartResult:
+    start: np.ndarray
+    x: np.ndarray
+    error: float
+    num_evaluations: int
+    is_dominated: bool = False
+    is_duplicate: bool = False
+    basin: int = -1
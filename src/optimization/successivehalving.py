@@ -0,0 +1,89 @@
+from math import ceil
+from typing import List, Tuple, Sequence, Dict
+
+import numpy as np
+from scipy.stats import spearmanr
+
+from src.evaluation import FidelityEvaluator
+from src.genetic.fitness import rank_errors
+
+
+class SuccessiveHalving:
+    """
+    Multi-fidelity screening of many candidates. All candidates get evaluated with the cheapest fidelity, only the best
+    1 / eta of them get promoted to the next fidelity, and so on, until the survivors get evaluated with full fidelity.
+
+    Fidelities are (timestep_factor, horizon) pairs, see FidelityEvaluator. The last fidelity should be (1, 1.0), so
+    the reported errors are the regular fitness values.
+    """
+    def __init__(
+            self,
+            mass: float,
+            delta_t: float,
+            setpoints: List[float],
+            external_force: List[float],
+            weight_factor: float,
+            fidelities: Sequence[Tuple[int, float]] = ((4, 0.5), (2, 1.0), (1, 1.0)),
+            eta: int = 3):
+        assert eta >= 2
+        self.eta = eta
+        self.evaluators = [
+            FidelityEvaluator(mass, delta_t, setpoints, external_force, weight_factor, timestep_factor, horizon)
+            for timestep_factor, horizon in fidelities
+        ]
+        self.rungs = []
+
+    def run(self, candidates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Screens the candidates
+        :param candidates: The (kp, ki, kd) combinations as (N, 3) Matrix
+        :return: The candidates which reached the last fidelity and their errors, sorted by error
+        """
+        survivors = np.asarray(candidates, dtype=float).reshape(-1, 3)
+        self.rungs = []
+        for level, evaluator in enumerate(self.evaluators):
+            errors = rank_errors(evaluator.evaluate(survivors))
+            order = np.argsort(errors, kind='stable')
+            self.rungs.append({
+                'timestep_factor': evaluator.timestep_factor,
+                'horizon': evaluator.horizon,
+                'num_candidates': len(survivors),
+                'relative_cost': evaluator.relative_cost * len(survivors)
+            })
+            if level == len(self.evaluators) - 1:
+                return survivors[order], errors[order]
+            survivors = survivors[order[:max(ceil(len(survivors) / self.eta), 1)]]
+
+    @property
+    def cost(self) -> float:
+        """
+        :return: Simulated steps of the last run in units of full-fidelity evaluations
+        """
+        return sum(rung['relative_cost'] for rung in self.rungs)
+
+    def calibrate(self, candidates: np.ndarray, top_k: int = 10) -> List[Dict[str, float]]:
+        """
+        Evaluates the candidates with every fidelity and compares the rankings with the full-fidelity ranking
+        :param candidates: The (kp, ki, kd) combinations as (N, 3) Matrix, a random sample of the search space
+        :param top_k: Size of the best group whose overlap gets reported
+        :return: Per fidelity the Spearman rank correlation with the last fidelity, the share of the full-fidelity
+        top_k which the fidelity ranks within its own top_k and the relative cost per candidate
+        """
+        candidates = np.asarray(candidates, dtype=float).reshape(-1, 3)
+        errors = [rank_errors(evaluator.evaluate(candidates)) for evaluator in self.evaluators]
+        reference_top = set(np.argsort(errors[-1], kind='stable')[:top_k])
+        # Infinite errors share the worst rank
+        reference_errors = np.where(np.isfinite(errors[-1]), errors[-1], np.finfo(float).max)
+
+        report = []
+        for evaluator, fidelity_errors in zip(self.evaluators, errors):
+            correlation = spearmanr(np.where(np.isfinite(fidelity_errors), fidelity_errors, np.finfo(float).max), reference_errors)[0]
+            report.append({
+                'timestep_factor': evaluator.timestep_factor,
+                'horizon': evaluator.horizon,
+                'spearman': float(correlation),
+                'top_k_overlap': len(reference_top & set(np.argsort(fidelity_errors, kind='stable')[:top_k])) / top_k,
+                'relative_cost': evaluator.relative_cost
+            })
+
+        return report
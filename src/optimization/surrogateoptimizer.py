@@ -0,0 +1,120 @@
+from typing import Tuple, Sequence
+
+import numpy as np
+from scipy.special import ndtr
+
+from src.evaluation import Evaluator
+from src.genetic.fitness import rank_errors
+from src.optimization.gaussianprocess import GaussianProcess
+
+
+class SurrogateOptimizer:
+    """
+    Bayesian optimizer which spends as few simulations as possible. A GaussianProcess models the logarithm of the
+    error over the scaled (kp, ki, kd) space and the expected improvement decides which candidates get simulated next.
+    Every round proposes a whole batch (kriging believer: each pick is added to the model with its predicted value
+    before the next pick), so the batch can be evaluated in parallel by the Evaluator, e.g. a PoolEvaluator running
+    BruteForcePlatform.execute.
+    """
+    def __init__(
+            self,
+            evaluator: Evaluator,
+            bounds: Sequence[Tuple[float, float]],
+            num_initial: int = 32,
+            batch_size: int = 8,
+            num_candidates: int = 4096,
+            exploration: float = 0.01,
+            seed: int | None = None):
+        """
+        :param bounds: (min, max) of kp, ki and kd
+        :param num_initial: Number of space-filling evaluations before the model takes over
+        :param batch_size: Number of candidates which get evaluated together
+        :param num_candidates: Number of random candidates the acquisition function gets maximized over
+        :param exploration: Minimum improvement in log error the expected improvement asks for
+        """
+        self.evaluator = evaluator
+        self.bounds = np.asarray(bounds, dtype=float)
+        self.num_initial = num_initial
+        self.batch_size = batch_size
+        self.num_candidates = num_candidates
+        self.exploration = exploration
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.empty((0, 3))
+        self.errors = np.empty(0)
+
+    def to_gains(self, x: np.ndarray) -> np.ndarray:
+        return self.bounds[:, 0] + x * (self.bounds[:, 1] - self.bounds[:, 0])
+
+    def latin_hypercube(self, num_samples: int) -> np.ndarray:
+        strata = np.array([self.rng.permutation(num_samples) for _ in range(3)]).T
+
+        return (strata + self.rng.uniform(size=(num_samples, 3))) / num_samples
+
+    def targets(self) -> np.ndarray:
+        # Model the log error, diverged runs get the worst finite error so they don't break the model
+        finite_errors = self.errors[np.isfinite(self.errors)]
+        worst_error = np.max(finite_errors) if len(finite_errors) else 1.0
+
+        return np.log(np.where(np.isfinite(self.errors), self.errors, worst_error) + 1)
+
+    def expected_improvement(self, model: GaussianProcess, x: np.ndarray, best_target: float) -> np.ndarray:
+        mean, std = model.predict(x)
+        improvement = best_target - mean - self.exploration
+        z = improvement / std
+
+        return improvement * ndtr(z) + std * np.exp(-z ** 2 / 2) / np.sqrt(2 * np.pi)
+
+    def candidates(self) -> np.ndarray:
+        # Half of the candidates explore the whole space, the other half refines around the best points so far
+        num_local = self.num_candidates // 2
+        best_x = self.x[np.argsort(self.targets())[:8]]
+        local = best_x[self.rng.integers(len(best_x), size=num_local)] + self.rng.normal(0, 0.05, (num_local, 3))
+
+        return np.clip(np.vstack((self.rng.uniform(size=(self.num_candidates - num_local, 3)), local)), 0, 1)
+
+    def propose(self) -> np.ndarray:
+        x, targets = self.x.copy(), self.targets()
+        model = GaussianProcess().fit(x, targets)
+        length_scale = model.length_scale
+        candidates = self.candidates()
+
+        batch = []
+        for _ in range(self.batch_size):
+            best_idx = int(np.argmax(self.expected_improvement(model, candidates, np.min(targets))))
+            batch.append(candidates[best_idx])
+            # Believe the prediction of the model for the pick, which pushes the next picks elsewhere
+            predicted_target = model.predict(candidates[best_idx:best_idx + 1])[0]
+            x, targets = np.vstack((x, candidates[best_idx])), np.append(targets, predicted_target)
+            candidates = np.delete(candidates, best_idx, axis=0)
+            model = GaussianProcess().fit(x, targets, length_scale)
+
+        return np.array(batch)
+
+    def observe(self, x: np.ndarray):
+        self.x = np.vstack((self.x, x))
+        self.errors = np.append(self.errors, self.evaluator.evaluate(self.to_gains(x)))
+
+    def run(self, num_evaluations: int, verbose: bool = False) -> Tuple[np.ndarray, float]:
+        """
+        Runs the optimizer
+        :param num_evaluations: Budget of simulations
+        :return: Best (kp, ki, kd) combination, Error
+        """
+        self.observe(self.latin_hypercube(min(self.num_initial, num_evaluations)))
+        while len(self.errors) < num_evaluations:
+            batch = self.propose()[:num_evaluations - len(self.errors)]
+            self.observe(batch)
+            if verbose:
+                print(f'{len(self.errors)} Evaluations, Min. Error: {np.min(rank_errors(self.errors))}')
+
+        return self.best()
+
+    def best(self) -> Tuple[np.ndarray, float]:
+        """
+        :return: Best (kp, ki, kd) combination, Error. If every run diverged, the first observation with an error of inf
+        """
+        errors = rank_errors(self.errors)
+        best_idx = int(np.argmin(errors))
+
+        return self.to_gains(self.x[best_idx]), float(errors[best_idx])
@@ -1 +1,3 @@
 from .pidcontroller import PIDController
+from .batchpidcontroller import BatchPIDController
+from .sensitivitypidcontroller import SensitivityPIDController
@@ -0,0 +1,39 @@
+import numpy as np
+
+from src.pid.pidcontroller import PIDController
+
+
+class BatchPIDController(PIDController):
+    """
+    Lockstep variant of the PIDController which holds one set of gains per batch entry.
+    Gains, integral and previous error are NumPy arrays of shape (size,), the setpoint may be shared or per entry.
+    """
+    def __init__(self, kp: np.ndarray, ki: np.ndarray, kd: np.ndarray, setpoint: float | np.ndarray):
+        super().__init__(np.asarray(kp, dtype=float), np.asarray(ki, dtype=float), np.asarray(kd, dtype=float), setpoint)
+        self.size = len(self.kp)
+        self.error = np.zeros(self.size)
+
+        self.prev_error = np.zeros(self.size)
+        self.integral = np.zeros(self.size)
+
+    def next(self, current_value: np.ndarray) -> np.ndarray:
+        self.error = self.setpoint - current_value
+        self.integral = self.integral + self.error
+        result = self.kp * self.error + self.ki * self.integral + self.kd * (self.error - self.prev_error)
+        self.prev_error = self.error
+
+        return result
+
+    def next_time_based(self, current_value: np.ndarray, time_interval: float) -> np.ndarray:
+        self.error = self.setpoint - current_value
+        self.integral = self.integral + self.error
+        time_based_derivative = (self.error - self.prev_error) / time_interval
+        result = self.kp * self.error + self.ki * self.integral + self.kd * time_based_derivative
+        self.prev_error = self.error
+
+        return result
+
+    def reset(self):
+        self.error = np.zeros(self.size)
+        self.prev_error = np.zeros(self.size)
+        self.integral = np.zeros(self.size)
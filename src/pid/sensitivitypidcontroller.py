@@ -0,0 +1,48 @@
+from typing import Tuple
+
+import numpy as np
+
+from src.pid.pidcontroller import PIDController
+
+
+class SensitivityPIDController(PIDController):
+    """
+    PIDController which additionally propagates the derivatives of its state with respect to its gains (kp, ki, kd)
+    (forward sensitivity equations). All gradients are Arrays of shape (3,).
+    """
+    def __init__(self, kp: float, ki: float, kd: float, setpoint: float):
+        super().__init__(kp, ki, kd, setpoint)
+        self.error_gradient = np.zeros(3)
+
+        self.prev_error_gradient = np.zeros(3)
+        self.integral_gradient = np.zeros(3)
+
+    def next_with_gradient(self, current_value: float, current_value_gradient: np.ndarray) -> Tuple[float, np.ndarray]:
+        """
+        Calculates the next output of the PID-Controller together with its gradient
+        :param current_value: The measured value
+        :param current_value_gradient: Derivative of the measured value with respect to (kp, ki, kd)
+        :return: Output, Derivative of the output with respect to (kp, ki, kd)
+        """
+        self.error = self.setpoint - current_value
+        self.error_gradient = -current_value_gradient
+        self.integral += self.error
+        self.integral_gradient = self.integral_gradient + self.error_gradient
+        derivative = self.error - self.prev_error
+        derivative_gradient = self.error_gradient - self.prev_error_gradient
+
+        result = self.kp * self.error + self.ki * self.integral + self.kd * derivative
+        # Product rule: the gains themselves are the parameters, so each term also contributes its own state
+        result_gradient = np.array([self.error, self.integral, derivative]) \
+            + self.kp * self.error_gradient + self.ki * self.integral_gradient + self.kd * derivative_gradient
+
+        self.prev_error = self.error
+        self.prev_error_gradient = self.error_gradient
+
+        return result, result_gradient
+
+    def reset(self):
+        super().reset()
+        self.error_gradient = np.zeros(3)
+        self.prev_error_gradient = np.zeros(3)
+        self.integral_gradient = np.zeros(3)
@@ -1 +1,5 @@
 from .simulation import Simulation
+from .batchsimulation import BatchSimulation
+from .sensitivitysimulation import SensitivitySimulation
+from .scenariobank import ScenarioBank
+from .scenario import Scenario, Segment
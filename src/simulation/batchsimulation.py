@@ -0,0 +1,83 @@
+from typing import Tuple
+
+import numpy as np
+
+from src.simulation.simulation import Simulation
+
+
+class BatchSimulation(Simulation):
+    """
+    Lockstep variant of the Simulation which advances a whole batch of independent balls with one vectorized step.
+    State which is a scalar in the Simulation is held as NumPy array of shape (size,) here.
+    """
+    def __init__(
+            self,
+            size: int,
+            mass: float | np.ndarray,
+            delta_t: float,
+            initial_angle: float = 0.0,
+            initial_velocity_x: float = 0.0,
+            initial_position_x: float = 0.0,
+            min_angle: float = -60.0,
+            max_angle: float = 60.0,
+            max_angle_change: float = Simulation.MAX_ANGLE_CHANGE):
+        super().__init__(
+            mass,
+            delta_t,
+            initial_angle,
+            initial_velocity_x,
+            initial_position_x,
+            min_angle,
+            max_angle,
+            max_angle_change)
+        self.size = size
+        self._angle = np.full(size, self._angle, dtype=float)
+        self.velocity_x = np.full(size, initial_velocity_x, dtype=float)
+        self.position_x = np.full(size, initial_position_x, dtype=float)
+
+    @property
+    def angle(self) -> np.ndarray:
+        return self._angle
+
+    @angle.setter
+    def angle(self, angle: np.ndarray):
+        # Check for Min and Max Angle
+        angle = np.clip(angle, self.min_angle, self.max_angle)
+
+        # Check for Min-Change and Max-Change of Angle
+        current_angle = np.degrees(self._angle)
+        angle = np.clip(angle, current_angle - self.max_angle_change, current_angle + self.max_angle_change)
+
+        self._angle = np.radians(angle)
+
+    def next(self, angle: np.ndarray | None = None, external_force: float | np.ndarray = 0.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculates the next Positions of all balls on their seesaws based on the provided parameters.
+        :param angle: Angles of the seesaws in Degree, one per ball
+        :param external_force: Force of the Wind pushing against the Balls, either shared or one per ball
+        :return: Angles, Velocities, Positions
+        """
+        # Update Angles if specified
+        if angle is not None:
+            self.angle = angle
+
+        # Apply Friction Force in corresponding direction
+        friction_force = self.ROLLING_FRICTION_COEFFICIENT * self.GRAVITY_CONSTANT * np.cos(self._angle)
+        friction_force = np.where(self.velocity_x < 0, -friction_force, friction_force)
+
+        # Calculate Acceleration alongside the Seesaw based on Gravity Constant
+        acceleration_x = -((self.GRAVITY_CONSTANT * np.sin(self._angle) + friction_force) / self.mass)
+
+        # Add Wind-Force
+        acceleration_x += external_force / self.mass
+
+        # Calculate new Velocities and Positions
+        self.velocity_x = self.velocity_x + acceleration_x * self.delta_t
+        self.position_x = self.position_x + self.velocity_x * self.delta_t
+
+        return np.degrees(self._angle), self.velocity_x, self.position_x
+
+    def reset(self):
+        self.angle = np.zeros(self.size)
+        self.velocity_x = np.zeros(self.size)
+        self.position_x = np.zeros(self.size)
@@ -0,0 +1,146 @@
+from typing import NamedTuple, Sequence, Tuple, List
+
+import numpy as np
+
+
+class Segment(NamedTuple):
+    start: int
+    duration: int
+    setpoint: float
+    external_force: float
+
+
+class Scenario:
+    """
+    Piecewise-constant scenario, stored as segments of steps with constant setpoint and external force. The expanded
+    per-step Arrays are only built on demand, the segments make the scenario tiny to store, hash and send to workers,
+    and the setpoint changes are known without scanning the steps.
+    """
+    def __init__(self, segments: Sequence[Segment | Tuple[int, int, float, float]]):
+        self.segments = tuple(Segment(int(start), int(duration), float(setpoint), float(external_force)) for start, duration, setpoint, external_force in segments)
+        assert len(self.segments) > 0
+        expected_start = 0
+        for segment in self.segments:
+            assert segment.start == expected_start and segment.duration > 0, 'Segments have to be consecutive and non-empty'
+            expected_start += segment.duration
+        self._setpoints = None
+        self._external_force = None
+
+    @staticmethod
+    def from_durations(durations: Sequence[Tuple[int, float, float]]) -> 'Scenario':
+        """
+        :param durations: Consecutive (duration in steps, setpoint, external force) triples
+        """
+        segments = []
+        start = 0
+        for duration, setpoint, external_force in durations:
+            segments.append(Segment(start, duration, setpoint, external_force))
+            start += duration
+
+        return Scenario(segments)
+
+    @staticmethod
+    def from_profiles(setpoint_profile: Sequence[Tuple[float, float]], external_force_profile: Sequence[Tuple[float, float]], fps: int) -> 'Scenario':
+        """
+        Creates a scenario from independent setpoint and external force profiles, e.g.
+            Scenario.from_profiles([(10, -10), (10, 5), (40, 0), (10, 8), (10, 0)], [(30, 0), (50, 1)], fps=30)
+        :param setpoint_profile: Consecutive (duration in seconds, setpoint) pairs
+        :param external_force_profile: Consecutive (duration in seconds, external force) pairs
+        """
+        def boundaries(profile: Sequence[Tuple[float, float]]) -> List[Tuple[int, float]]:
+            steps = np.cumsum([int(round(duration * fps)) for duration, _ in profile])
+
+            return list(zip(steps.tolist(), [value for _, value in profile]))
+
+        setpoint_boundaries = boundaries(setpoint_profile)
+        external_force_boundaries = boundaries(external_force_profile)
+        assert setpoint_boundaries[-1][0] == external_force_boundaries[-1][0], 'Both profiles have to be equally long'
+
+        # Merge both profiles, a new segment starts wherever one of them changes
+        ends = sorted({end for end, _ in setpoint_boundaries} | {end for end, _ in external_force_boundaries})
+        segments = []
+        start = 0
+        for end in ends:
+            setpoint = next(value for boundary, value in setpoint_boundaries if boundary >= end)
+            external_force = next(value for boundary, value in external_force_boundaries if boundary >= end)
+            segments.append(Segment(start, end - start, setpoint, external_force))
+            start = end
+
+        return Scenario(segments)
+
+    @staticmethod
+    def from_arrays(setpoints: Sequence[float], external_force: Sequence[float]) -> 'Scenario':
+        """
+        Compresses per-step lists into segments
+        """
+        setpoints = np.asarray(setpoints, dtype=float)
+        external_force = np.asarray(external_force, dtype=float)
+        assert len(setpoints) == len(external_force) > 0
+        starts = np.concatenate(([0], np.where((np.diff(setpoints) != 0) | (np.diff(external_force) != 0))[0] + 1))
+        durations = np.diff(np.append(starts, len(setpoints)))
+
+        return Scenario(zip(starts.tolist(), durations.tolist(), setpoints[starts].tolist(), external_force[starts].tolist()))
+
+    def __len__(self) -> int:
+        return self.segments[-1].start + self.segments[-1].duration
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Scenario) and self.segments == other.segments
+
+    def __hash__(self) -> int:
+        return hash(self.segments)
+
+    def __getstate__(self):
+        # Only the segments get sent to other processes, the expanded Arrays get rebuilt on demand
+        return {'segments': self.segments, '_setpoints': None, '_external_force': None}
+
+    @property
+    def initial_setpoint(self) -> float:
+        return self.segments[0].setpoint
+
+    @property
+    def setpoints(self) -> np.ndarray:
+        if self._setpoints is None:
+            self._setpoints = np.repeat([segment.setpoint for segment in self.segments], [segment.duration for segment in self.segments])
+
+        return self._setpoints
+
+    @property
+    def external_force(self) -> np.ndarray:
+        if self._external_force is None:
+            self._external_force = np.repeat([segment.external_force for segment in self.segments], [segment.duration for segment in self.segments])
+
+        return self._external_force
+
+    @property
+    def setpoint_changes(self) -> np.ndarray:
+        """
+        :return: The setpoint changes as the fitness function defines them, in the coordinates of the data with the
+        synthetic 0 in the beginning
+        """
+        setpoint_changes = []
+        previous_setpoint = 0
+        for segment in self.segments:
+            if segment.setpoint != previous_setpoint:
+                setpoint_changes.append(segment.start)
+            previous_setpoint = segment.setpoint
+
+        return np.array(setpoint_changes, dtype=int)
+
+    @property
+    def breakpoints(self) -> np.ndarray:
+        """
+        :return: Steps at which setpoint or external force change
+        """
+        return np.array([segment.start for segment in self.segments[1:]], dtype=int)
+
+    def setpoint_at(self, step: int) -> float:
+        return self.segment_at(step).setpoint
+
+    def external_force_at(self, step: int) -> float:
+        return self.segment_at(step).external_force
+
+    def segment_at(self, step: int) -> Segment:
+        starts = [segment.start for segment in self.segments]
+
+        return self.segments[int(np.searchsorted(starts, step, side='right')) - 1]
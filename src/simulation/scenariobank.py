@@ -0,0 +1,38 @@
+from itertools import product
+from typing import Sequence, List
+
+import numpy as np
+
+
+class ScenarioBank:
+    """
+    Collection of scenarios which a controller has to handle, e.g. different ball masses and disturbances. All
+    scenarios share the same number of steps and timestep, scenario s consists of masses[s], setpoints[s] and
+    external_forces[s].
+    """
+    def __init__(self, masses: Sequence[float], setpoints: Sequence[Sequence[float]], external_forces: Sequence[Sequence[float]]):
+        self.masses = np.asarray(masses, dtype=float)
+        self.setpoints = np.atleast_2d(np.asarray(setpoints, dtype=float))
+        self.external_forces = np.atleast_2d(np.asarray(external_forces, dtype=float))
+        assert len(self.masses) == len(self.setpoints) == len(self.external_forces)
+        assert self.setpoints.shape == self.external_forces.shape
+
+    @staticmethod
+    def from_product(masses: Sequence[float], setpoint_profiles: Sequence[List[float]], external_force_profiles: Sequence[List[float]]) -> 'ScenarioBank':
+        """
+        Creates a scenario for every combination of mass, setpoint profile and external force profile
+        """
+        scenarios = list(product(masses, setpoint_profiles, external_force_profiles))
+
+        return ScenarioBank(
+            [mass for mass, _, _ in scenarios],
+            [setpoints for _, setpoints, _ in scenarios],
+            [external_force for _, _, external_force in scenarios]
+        )
+
+    def __len__(self) -> int:
+        return len(self.masses)
+
+    @property
+    def num_steps(self) -> int:
+        return self.setpoints.shape[1]
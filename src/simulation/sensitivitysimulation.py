@@ -0,0 +1,101 @@
+from math import sin, cos, radians, degrees
+from typing import Tuple
+
+import numpy as np
+
+from src.simulation.simulation import Simulation
+
+
+class SensitivitySimulation(Simulation):
+    """
+    Simulation which additionally propagates the derivatives of angle, velocity and position with respect to the gains
+    of the PID-Controller (forward sensitivity equations). All gradients are Arrays of shape (3,).
+
+    The angle clamps are not differentiable where they switch on. While a clamp is active the derivative of the
+    commanded angle gets blended with clamp_gradient: 0 gives the exact one-sided derivative (the clamp blocks the
+    gradient), values up to 1 let more of the commanded gradient leak through, which keeps saturated candidates from
+    getting stuck.
+    """
+    def __init__(
+            self,
+            mass: float,
+            delta_t: float,
+            initial_angle: float = 0.0,
+            initial_velocity_x: float = 0.0,
+            initial_position_x: float = 0.0,
+            min_angle: float = -60.0,
+            max_angle: float = 60.0,
+            max_angle_change: float = Simulation.MAX_ANGLE_CHANGE,
+            clamp_gradient: float = 0.0):
+        super().__init__(
+            mass,
+            delta_t,
+            initial_angle,
+            initial_velocity_x,
+            initial_position_x,
+            min_angle,
+            max_angle,
+            max_angle_change)
+        assert 0 <= clamp_gradient <= 1
+        self.clamp_gradient = clamp_gradient
+        self.angle_gradient = np.zeros(3)
+        self.velocity_x_gradient = np.zeros(3)
+        self.position_x_gradient = np.zeros(3)
+
+    def set_angle_with_gradient(self, angle: float, angle_gradient: np.ndarray):
+        # Check for Min and Max Angle
+        if angle > self.max_angle:
+            angle = self.max_angle
+            angle_gradient = self.clamp_gradient * angle_gradient
+        elif angle < self.min_angle:
+            angle = self.min_angle
+            angle_gradient = self.clamp_gradient * angle_gradient
+
+        # Check for Min-Change and Max-Change of Angle, the clamped angle follows the previous angle
+        previous_angle = degrees(self.angle)
+        if angle > (previous_angle + self.max_angle_change):
+            angle = previous_angle + self.max_angle_change
+            angle_gradient = (1 - self.clamp_gradient) * self.angle_gradient + self.clamp_gradient * angle_gradient
+        elif angle < (previous_angle - self.max_angle_change):
+            angle = previous_angle - self.max_angle_change
+            angle_gradient = (1 - self.clamp_gradient) * self.angle_gradient + self.clamp_gradient * angle_gradient
+
+        self._angle = radians(angle)
+        self.angle_gradient = angle_gradient
+
+    def next_with_gradient(self, angle: float, angle_gradient: np.ndarray, external_force: float = 0.0) -> Tuple[float, float, float, np.ndarray]:
+        """
+        Calculates the next Position of the ball together with its derivative with respect to the gains
+        :param angle: Angle of the seesaw in Degree
+        :param angle_gradient: Derivative of the angle with respect to (kp, ki, kd)
+        :param external_force: Force of the Wind pushing against the Ball
+        :return: Angle, Velocity, Position, Derivative of the Position with respect to (kp, ki, kd)
+        """
+        self.set_angle_with_gradient(angle, angle_gradient)
+        angle_gradient_radians = radians(1) * self.angle_gradient
+
+        # Apply Friction Force in corresponding direction, the direction is piecewise constant
+        direction = -1 if self.velocity_x < 0 else 1
+        friction_force = direction * self.ROLLING_FRICTION_COEFFICIENT * self.GRAVITY_CONSTANT * cos(self.angle)
+        friction_force_gradient = -direction * self.ROLLING_FRICTION_COEFFICIENT * self.GRAVITY_CONSTANT * sin(self.angle) * angle_gradient_radians
+
+        # Calculate Acceleration alongside the Seesaw based on Gravity Constant
+        acceleration_x = -((self.GRAVITY_CONSTANT * sin(self.angle) + friction_force) / self.mass)
+        acceleration_x_gradient = -((self.GRAVITY_CONSTANT * cos(self.angle) * angle_gradient_radians + friction_force_gradient) / self.mass)
+
+        # Add Wind-Force
+        acceleration_x += external_force / self.mass
+
+        # Calculate new Velocity and Position
+        self.velocity_x += acceleration_x * self.delta_t
+        self.velocity_x_gradient = self.velocity_x_gradient + acceleration_x_gradient * self.delta_t
+        self.position_x += self.velocity_x * self.delta_t
+        self.position_x_gradient = self.position_x_gradient + self.velocity_x_gradient * self.delta_t
+
+        return degrees(self.angle), self.velocity_x, self.position_x, self.position_x_gradient
+
+    def reset(self):
+        super().reset()
+        self.angle_gradient = np.zeros(3)
+        self.velocity_x_gradient = np.zeros(3)
+        self.position_x_gradient = np.zeros(3)
@@ -5,6 +5,7 @@ from typing import Tuple
 class Simulation:
     ROLLING_FRICTION_COEFFICIENT = 0.04
     GRAVITY_CONSTANT = 9.81
+    MAX_ANGLE_CHANGE = 4.0
 
     def __init__(
             self,
@@ -15,7 +16,7 @@ class Simulation:
             initial_position_x: float = 0.0,
             min_angle: float = -60.0,
             max_angle: float = 60.0,
-            max_angle_change: float = 4.0):
+            max_angle_change: float = MAX_ANGLE_CHANGE):
         self.mass = mass
         self.delta_t = delta_t
         self._angle = radians(initial_angle)
@@ -0,0 +1,2 @@
+from .telemetrylogger import TelemetryLogger
+from .telemetryreader import TelemetryReader
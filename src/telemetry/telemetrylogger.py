@@ -0,0 +1,126 @@
+import json
+import threading
+import time
+
+import numpy as np
+
+
+class TelemetryLogger:
+    """
+    Streams telemetry into a preallocated ring buffer of fixed size, a background thread appends the buffered records
+    in chunks to a binary file. The memory stays constant for sessions of any length and everything up to the last
+    flush survives a crash. If the writer falls behind by a whole buffer, log blocks until there is space again.
+
+    File format: MAGIC, the length of the header as uint32, a JSON header (fields, dtype, start time) padded to
+    HEADER_ALIGNMENT bytes and the records in the structured dtype DTYPE, which is how TelemetryReader memory-maps the
+    file. A partially written last record gets ignored by the reader.
+    """
+    MAGIC = b'PIDTLM01'
+    HEADER_ALIGNMENT = 64
+    FIELDS = ('timestamp', 'angle', 'velocity', 'position', 'setpoint', 'external_force')
+    DTYPE = np.dtype([(field, '<f8') for field in FIELDS])
+
+    def __init__(self, filename: str, capacity: int = 4096, chunk_size: int = 512, flush_interval: float = 1.0):
+        """
+        :param capacity: Number of records the ring buffer holds
+        :param chunk_size: Number of records which get written at once, earlier after flush_interval seconds
+        """
+        assert 0 < chunk_size <= capacity
+        self.filename = filename
+        self.capacity = capacity
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.buffer = np.zeros(capacity, dtype=self.DTYPE)
+        self.start_time = time.time()
+        self.num_logged = 0
+        self.num_flushed = 0
+        self._start_counter = time.perf_counter()
+        self._closed = False
+        self._flush_requested = False
+        self._condition = threading.Condition()
+
+        self._file = open(filename, 'wb')
+        self._write_header()
+        self._writer = threading.Thread(target=self._write, daemon=True)
+        self._writer.start()
+
+    def __enter__(self) -> 'TelemetryLogger':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def log(self, angle: float, velocity: float, position: float, setpoint: float = float('nan'), external_force: float = 0.0, timestamp: float | None = None):
+        """
+        :param setpoint: NaN if there is none, e.g. while the seesaw gets controlled by the keyboard
+        :param timestamp: Seconds, e.g. the simulated time. Defaults to the wall-clock seconds since the start of the logger
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter() - self._start_counter
+        with self._condition:
+            assert not self._closed
+            while self.num_logged - self.num_flushed >= self.capacity:
+                self._condition.wait()
+            self.buffer[self.num_logged % self.capacity] = (timestamp, angle, velocity, position, setpoint, external_force)
+            self.num_logged += 1
+            if self.num_logged - self.num_flushed >= self.chunk_size:
+                self._condition.notify_all()
+
+    def flush(self):
+        """
+        Blocks until everything logged so far got written
+        """
+        with self._condition:
+            target = self.num_logged
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self.num_flushed < target:
+                self._condition.wait()
+
+    def close(self):
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._writer.join()
+        self._file.close()
+
+    def _write_header(self):
+        header = json.dumps({
+            'fields': self.FIELDS,
+            'dtype': self.DTYPE.descr,
+            'start_time': self.start_time
+        }).encode()
+        unpadded_length = len(self.MAGIC) + 4 + len(header)
+        header += b' ' * (-unpadded_length % self.HEADER_ALIGNMENT)
+        self._file.write(self.MAGIC + np.uint32(len(header)).tobytes() + header)
+        self._file.flush()
+
+    def _write(self):
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self.flush_interval
+                while not (self._closed or self._flush_requested) and self.num_logged - self.num_flushed < self.chunk_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                self._flush_requested = False
+                start, stop = self.num_flushed, self.num_logged
+                closed = self._closed
+
+            # The records between start and stop don't get overwritten before num_flushed moves past them
+            if start < stop:
+                first, last = start % self.capacity, (stop - 1) % self.capacity + 1
+                if first < last:
+                    self._file.write(self.buffer[first:last].tobytes())
+                else:
+                    self._file.write(self.buffer[first:].tobytes())
+                    self._file.write(self.buffer[:last].tobytes())
+                self._file.flush()
+                with self._condition:
+                    self.num_flushed = stop
+                    self._condition.notify_all()
+            elif closed:
+                return
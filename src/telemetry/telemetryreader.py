@@ -0,0 +1,58 @@
+import json
+import os
+
+import numpy as np
+
+from src.telemetry.telemetrylogger import TelemetryLogger
+
+
+class TelemetryReader:
+    """
+    Memory-maps a file of the TelemetryLogger, the columns are views into the file and nothing gets parsed. Files
+    which are still being written can be read as well, reopen the reader to see the newer records.
+    """
+    def __init__(self, filename: str):
+        with open(filename, 'rb') as file:
+            magic = file.read(len(TelemetryLogger.MAGIC))
+            if magic != TelemetryLogger.MAGIC:
+                raise ValueError(f'{filename} is not a telemetry file')
+            header_length = int(np.frombuffer(file.read(4), dtype=np.uint32)[0])
+            header = json.loads(file.read(header_length))
+
+        self.filename = filename
+        self.fields = tuple(header['fields'])
+        self.start_time = header['start_time']
+        dtype = np.dtype([tuple(field) for field in header['dtype']])
+        offset = len(TelemetryLogger.MAGIC) + 4 + header_length
+        # A crash can leave a partially written record at the end
+        num_records = (os.path.getsize(filename) - offset) // dtype.itemsize
+        if num_records > 0:
+            self.records = np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=(num_records,))
+        else:
+            self.records = np.zeros(0, dtype=dtype)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.records[field]
+
+    def time_range(self, start: float | None = None, stop: float | None = None) -> np.ndarray:
+        """
+        :param start: Timestamp in seconds, inclusive. The visualizations log the simulated time
+        :param stop: Timestamp in seconds, exclusive
+        :return: Records within the time range, a view into the file
+        """
+        timestamps = self.records['timestamp']
+        first = 0 if start is None else np.searchsorted(timestamps, start, side='left')
+        last = len(timestamps) if stop is None else np.searchsorted(timestamps, stop, side='left')
+
+        return self.records[first:last]
+
+    def to_dataframe(self, start: float | None = None, stop: float | None = None):
+        """
+        :return: pandas DataFrame of the records within the time range, indexed by the timestamp
+        """
+        import pandas as pd
+
+        return pd.DataFrame(np.asarray(self.time_range(start, stop))).set_index('timestamp')
@@ -1,2 +1,28 @@
-from .visualizationtype import VisualizationType
-from .visualizationfactory import VisualizationFactory
+"""
+The visualization layer depends on pygame, its classes only get imported on first access (PEP 562), so the headless
+core (simulation, pid, genetic, bruteforce) and pool workers can import this package without paying for pygame.
+"""
+import importlib
+
+# Exported name -> module which defines it
+_EXPORTS = {
+    'VisualizationType': '.visualizationtype',
+    'VisualizationFactory': '.visualizationfactory',
+    'ReplayVisualization': '.replayvisualization',
+    'RenderCache': '.rendercache'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,6 +2,7 @@ import pygame as py
 
 from src.simulation import Simulation
 from src.visualization.visualization import Visualization
+from src.instrumentation import Instrumentation
 
 
 class KeyboardVisualization(Visualization):
@@ -13,7 +14,7 @@ class KeyboardVisualization(Visualization):
             initial_external_force: float = 0.0,
             max_external_force: float = 2.5,
             log_data: bool = False,
-            log_filename: str = 'data.csv'):
+            log_filename: str = 'telemetry.bin'):
         super().__init__(
             simulation,
             fps,
@@ -26,9 +27,10 @@ class KeyboardVisualization(Visualization):
 
     def run(self):
         running = True
+        step = 0
         while running:
             self.clock.tick(self.fps)
-            self.screen.fill(self.WHITE)
+            self.begin_frame()
 
             for event in py.event.get():
                 if event.type == py.QUIT:
@@ -73,20 +75,24 @@ class KeyboardVisualization(Visualization):
                         self.is_marker_visible = not self.is_marker_visible
 
             # Simulate next Step
-            angle, velocity, position = self.simulation.next(self.angle, self.external_force)
+            with Instrumentation.timer('visualization.simulation'):
+                angle, velocity, position = self.simulation.next(self.angle, self.external_force)
+                step += 1
 
             # Log Data
-            self.log(angle, velocity, position)
+            self.log(step, angle, velocity, position, None, self.external_force)
 
             # Render Elements
-            self.render_seesaw()
-            self.render_ball(position * self.SCALE)
-            if self.is_marker_visible:
-                self.render_marker(self.marker_position)
-            self.render_external_force_arrow(self.external_force)
-            self.render_data(angle, velocity, position, self.external_force)
+            with Instrumentation.timer('visualization.render'):
+                self.render_seesaw()
+                self.render_ball(position * self.SCALE)
+                if self.is_marker_visible:
+                    self.render_marker(self.marker_position)
+                self.render_external_force_arrow(self.external_force)
+                self.render_data(angle, velocity, position, self.external_force)
 
-            py.display.flip()
+                self.present()
+            Instrumentation.count('visualization.frames')
 
         self.save_log()
         py.quit()
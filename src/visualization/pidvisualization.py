@@ -1,9 +1,10 @@
-import pandas as pd
 import pygame as py
 
 from src.visualization.visualization import Visualization
 from src.simulation.simulation import Simulation
+from src.simulation.scenario import Scenario
 from src.pid.pidcontroller import PIDController
+from src.instrumentation import Instrumentation
 
 
 class PIDVisualization(Visualization):
@@ -17,7 +18,8 @@ class PIDVisualization(Visualization):
             initial_external_force: float = 0.0,
             max_external_force: float = 2.5,
             log_data: bool = False,
-            log_filename: str = 'data.csv'):
+            log_filename: str = 'telemetry.bin',
+            scenario: Scenario | None = None):
         super().__init__(
             simulation,
             fps,
@@ -28,24 +30,23 @@ class PIDVisualization(Visualization):
             log_data,
             log_filename)
         self.pid_controller = pid_controller
+        self.scenario = scenario
 
     def render_pid_data(self):
         # Render P-Term
-        p_text_surface = self.font.render(f'P: {self.pid_controller.kp}', True, (0, 0, 0))
-        self.screen.blit(p_text_surface, (10, self.SCREEN_HEIGHT - 90))
+        self.render_text(f'P: {self.pid_controller.kp}', (10, self.SCREEN_HEIGHT - 90))
         # Render I-Term
-        i_text_surface = self.font.render(f'I:  {self.pid_controller.ki}', True, (0, 0, 0))
-        self.screen.blit(i_text_surface, (10, self.SCREEN_HEIGHT - 60))
+        self.render_text(f'I:  {self.pid_controller.ki}', (10, self.SCREEN_HEIGHT - 60))
         # Render D-Term
-        d_text_surface = self.font.render(f'D: {self.pid_controller.kd}', True, (0, 0, 0))
-        self.screen.blit(d_text_surface, (10, self.SCREEN_HEIGHT - 30))
+        self.render_text(f'D: {self.pid_controller.kd}', (10, self.SCREEN_HEIGHT - 30))
 
     def run(self):
         running = True
         position = self.initial_position_x
+        step = 0
         while running:
             self.clock.tick(self.fps)
-            self.screen.fill(self.WHITE)
+            self.begin_frame()
 
             # Listen on Keypress-Events
             for event in py.event.get():
@@ -82,28 +83,37 @@ class PIDVisualization(Visualization):
                     elif event.key == py.K_0:
                         self.is_marker_visible = not self.is_marker_visible
 
-            # Calculate new angle using the PID-Controller
-            marker_distance = (self.SEESAW_LENGTH / self.SCALE) / (self.num_marker_positions - 1)
-            self.pid_controller.setpoint = self.marker_position * marker_distance - (self.SEESAW_LENGTH / self.SCALE) / 2
-            new_angle = self.pid_controller.next(position)
+            with Instrumentation.timer('visualization.simulation'):
+                # Calculate new angle using the PID-Controller, a Scenario replaces the marker and the keyboard wind
+                if self.scenario is not None:
+                    scenario_step = step % len(self.scenario)
+                    self.pid_controller.setpoint = self.scenario.setpoint_at(scenario_step)
+                    self.external_force = self.scenario.external_force_at(scenario_step)
+                else:
+                    marker_distance = (self.SEESAW_LENGTH / self.SCALE) / (self.num_marker_positions - 1)
+                    self.pid_controller.setpoint = self.marker_position * marker_distance - (self.SEESAW_LENGTH / self.SCALE) / 2
+                new_angle = self.pid_controller.next(position)
+                step += 1
 
-            # Simulate next Step
-            angle, velocity, position = self.simulation.next(new_angle, self.external_force)
-            self.angle = angle
+                # Simulate next Step
+                angle, velocity, position = self.simulation.next(new_angle, self.external_force)
+                self.angle = angle
 
             # Log Data
-            self.log(angle, velocity, position)
+            self.log(step, angle, velocity, position, self.pid_controller.setpoint, self.external_force)
 
             # Render Elements
-            self.render_seesaw()
-            self.render_ball(position * self.SCALE)
-            if self.is_marker_visible:
-                self.render_marker(self.marker_position)
-            self.render_external_force_arrow(self.external_force)
-            self.render_data(angle, velocity, position, self.external_force)
-            self.render_pid_data()
+            with Instrumentation.timer('visualization.render'):
+                self.render_seesaw()
+                self.render_ball(position * self.SCALE)
+                if self.is_marker_visible:
+                    self.render_marker(self.marker_position)
+                self.render_external_force_arrow(self.external_force)
+                self.render_data(angle, velocity, position, self.external_force)
+                self.render_pid_data()
 
-            py.display.flip()
+                self.present()
+            Instrumentation.count('visualization.frames')
 
         self.save_log()
         py.quit()
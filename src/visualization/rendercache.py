@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from typing import Tuple, List, Hashable, Callable, Any
+
+import pygame as py
+
+
+class RenderCache:
+    """
+    Caches the expensive parts of rendering a frame, all of them bounded by an LRU eviction:
+        - Rotated surfaces, the angle gets quantized to angle_resolution degrees
+        - Text surfaces by font, displayed string and color
+        - Fonts by name and size, so visualizations sharing the cache share their texts too
+        - Polygons, e.g. the external force arrow, by their parameters
+    One cache can be shared by several visualizations, e.g. to render many seesaws at once. The cached surfaces and
+    fonts belong to the running pygame session, the cache has to be cleared when pygame gets shut down.
+    """
+    def __init__(self, angle_resolution: float = 0.1, max_rotations: int = 2048, max_texts: int = 1024, max_polygons: int = 256):
+        assert angle_resolution > 0
+        self.angle_resolution = angle_resolution
+        self.rotations = OrderedDict()
+        self.texts = OrderedDict()
+        self.polygons = OrderedDict()
+        self.fonts = {}
+        self.max_rotations = max_rotations
+        self.max_texts = max_texts
+        self.max_polygons = max_polygons
+        self.hits = 0
+        self.misses = 0
+
+    def rotated(self, surface: py.Surface, angle: float, key: Hashable | None = None) -> py.Surface:
+        """
+        :param angle: Angle in Degree, counterclockwise like pygame.transform.rotate
+        :param key: Identifies the content of the surface, defaults to the surface itself. Visualizations which create
+        equal surfaces can share their rotations with equal keys
+        """
+        quantized_angle = round(angle / self.angle_resolution)
+        key = surface if key is None else key
+
+        return self.lookup(self.rotations, self.max_rotations, (key, quantized_angle), lambda: py.transform.rotate(surface, quantized_angle * self.angle_resolution))
+
+    def font(self, name: str, size: int) -> py.font.Font:
+        key = (name, size)
+        if key not in self.fonts:
+            self.fonts[key] = py.font.SysFont(name, size)
+
+        return self.fonts[key]
+
+    def text(self, font: py.font.Font, text: str, color: Tuple[int, int, int]) -> py.Surface:
+        return self.lookup(self.texts, self.max_texts, (font, text, color), lambda: font.render(text, True, color))
+
+    def polygon(self, key: Hashable, create: Callable[[], List[Tuple[float, float]]]) -> List[Tuple[float, float]]:
+        return self.lookup(self.polygons, self.max_polygons, key, create)
+
+    def lookup(self, cache: OrderedDict, max_size: int, key: Hashable, create: Callable[[], Any]) -> Any:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+        self.misses += 1
+        value = create()
+        cache[key] = value
+        if len(cache) > max_size:
+            cache.popitem(last=False)
+
+        return value
+
+    def clear(self):
+        self.rotations.clear()
+        self.texts.clear()
+        self.polygons.clear()
+        self.fonts.clear()
@@ -0,0 +1,166 @@
+import os
+from typing import Iterator, Tuple, Sequence, List
+
+import pygame as py
+
+from src.visualization.visualization import Visualization
+from src.visualization.rendercache import RenderCache
+from src.simulation.simulation import Simulation
+from src.simulation.scenario import Scenario
+from src.pid.pidcontroller import PIDController
+from src.instrumentation import Instrumentation
+
+
+class ReplayVisualization(Visualization):
+    """
+    Replays a trajectory as fast as possible instead of in real time, either a precomputed one or one which gets
+    simulated on the fly with the fixed timestep of the simulation. Simulation and rendering are decoupled: every step
+    gets simulated, but only every frame_skip-th step gets rendered.
+
+    With an output_directory every rendered frame gets saved as frame_000000.png, frame_000001.png, ... which can be
+    turned into a video with the frame rate fps / frame_skip, e.g.
+        ffmpeg -framerate 10 -i frame_%06d.png replay.mp4
+    In headless mode no window gets opened, so replays can be exported on machines without a display.
+    """
+    def __init__(
+            self,
+            simulation: Simulation,
+            fps: int,
+            steps: Iterator[Tuple[float, float, float, float | None, float]],
+            frame_skip: int = 1,
+            output_directory: str | None = None,
+            image_format: str = 'png',
+            headless: bool = True,
+            realtime: bool = False,
+            log_data: bool = False,
+            log_filename: str = 'telemetry.bin',
+            title: str | None = None,
+            render_cache: RenderCache | None = None,
+            dirty_rects: bool = True):
+        """
+        :param steps: Angle, velocity, position, setpoint (None hides the marker) and external force of every step
+        :param frame_skip: Only every frame_skip-th step gets rendered
+        :param image_format: File extension of the exported frames, 'bmp' is uncompressed and a lot faster to write
+        :param realtime: Limit the replay to the real time speed, only used with a window
+        :param title: Text rendered below the data, e.g. the gains of the controller
+        :param render_cache: export_candidates shares one between all candidates
+        """
+        assert frame_skip >= 1
+        super().__init__(simulation, fps, 0.0, 0.0, 0.0, 2.5, log_data, log_filename, headless, render_cache, dirty_rects)
+        self.steps = steps
+        self.frame_skip = frame_skip
+        self.output_directory = output_directory
+        self.image_format = image_format
+        self.realtime = realtime
+        self.title = title
+
+    @staticmethod
+    def from_trajectory(
+            fps: int,
+            angles: Sequence[float],
+            velocities: Sequence[float],
+            positions: Sequence[float],
+            external_force: Sequence[float],
+            setpoints: Sequence[float] | None = None,
+            **kwargs) -> 'ReplayVisualization':
+        """
+        Replays a precomputed trajectory, e.g. a logged one
+        """
+        setpoints = setpoints if setpoints is not None else [None] * len(positions)
+        steps = zip(angles, velocities, positions, setpoints, external_force)
+
+        return ReplayVisualization(Simulation(mass=0.2, delta_t=1 / fps), fps, steps, **kwargs)
+
+    @staticmethod
+    def from_controller(pid_controller: PIDController, simulation: Simulation, scenario: Scenario, fps: int, **kwargs) -> 'ReplayVisualization':
+        """
+        Simulates the PID-Controller on the scenario while replaying it
+        """
+        def steps() -> Iterator[Tuple[float, float, float, float, float]]:
+            position = simulation.position_x
+            for setpoint, external_force in zip(scenario.setpoints.tolist(), scenario.external_force.tolist()):
+                pid_controller.setpoint = setpoint
+                angle, velocity, position = simulation.next(pid_controller.next(position), external_force)
+                yield angle, velocity, position, setpoint, external_force
+
+        kwargs.setdefault('title', f'P: {pid_controller.kp}  I: {pid_controller.ki}  D: {pid_controller.kd}')
+
+        return ReplayVisualization(simulation, fps, steps(), **kwargs)
+
+    @staticmethod
+    def export_candidates(gains: Sequence[Tuple[float, float, float]], scenario: Scenario, directory: str, fps: int = 30, mass: float = 0.2, frame_skip: int = 3, image_format: str = 'png') -> List[str]:
+        """
+        Exports the replays of several controllers, every one into its own subdirectory of directory. All candidates
+        render in one pygame session and share one RenderCache.
+        :return: The directories of the frames, in the order of the gains
+        """
+        output_directories = []
+        render_cache = RenderCache()
+        try:
+            for idx, (kp, ki, kd) in enumerate(gains):
+                output_directory = os.path.join(directory, f'candidate_{idx:04d}')
+                pid_controller = PIDController(kp, ki, kd, scenario.initial_setpoint)
+                simulation = Simulation(mass=mass, delta_t=1 / fps)
+                replay = ReplayVisualization.from_controller(pid_controller, simulation, scenario, fps, frame_skip=frame_skip, output_directory=output_directory, image_format=image_format, render_cache=render_cache)
+                replay.run(quit_pygame=False)
+                output_directories.append(output_directory)
+        finally:
+            py.quit()
+            render_cache.clear()
+
+        return output_directories
+
+    def render_setpoint(self, setpoint: float):
+        # Position of the setpoint in units of the marker spacing
+        marker_distance = self.SEESAW_LENGTH / (self.num_marker_positions - 1)
+        self.render_marker((setpoint * self.SCALE + self.SEESAW_LENGTH / 2) / marker_distance)
+
+    def render_title(self):
+        if self.title is not None:
+            self.render_text(self.title, (10, self.SCREEN_HEIGHT - 30))
+
+    def run(self, quit_pygame: bool = True) -> int:
+        """
+        :param quit_pygame: Shut pygame down after the replay, export_candidates keeps it running for the next one
+        :return: Number of rendered frames
+        """
+        if self.output_directory is not None:
+            os.makedirs(self.output_directory, exist_ok=True)
+
+        num_frames = 0
+        for step, (angle, velocity, position, setpoint, external_force) in enumerate(self.steps):
+            self.log(step + 1, angle, velocity, position, setpoint, external_force)
+            if step % self.frame_skip != 0:
+                continue
+
+            if not self.headless:
+                if self.realtime:
+                    self.clock.tick(self.fps / self.frame_skip)
+                if any(event.type == py.QUIT for event in py.event.get()):
+                    break
+
+            # Render Elements
+            with Instrumentation.timer('visualization.render'):
+                self.angle = angle
+                self.external_force = external_force
+                self.begin_frame()
+                self.render_seesaw()
+                self.render_ball(position * self.SCALE)
+                if setpoint is not None:
+                    self.render_setpoint(setpoint)
+                self.render_external_force_arrow(external_force)
+                self.render_data(angle, velocity, position, external_force)
+                self.render_title()
+                self.present()
+
+            if self.output_directory is not None:
+                with Instrumentation.timer('visualization.export'):
+                    py.image.save(self.screen, os.path.join(self.output_directory, f'frame_{num_frames:06d}.{self.image_format}'))
+            Instrumentation.count('visualization.frames')
+            num_frames += 1
+
+        self.save_log()
+        if quit_pygame:
+            py.quit()
+
+        return num_frames
@@ -1,11 +1,13 @@
+import os
 from abc import ABC, abstractmethod
 from math import sin, tan, cos, radians
 
-import pandas as pd
 import pygame
 import pygame as py
 
 from src.simulation import Simulation
+from src.telemetry import TelemetryLogger
+from src.visualization.rendercache import RenderCache
 
 
 class Visualization(ABC):
@@ -31,7 +33,17 @@ class Visualization(ABC):
             initial_external_force: float,
             max_external_force: float,
             log_data: bool,
-            log_filename: str):
+            log_filename: str,
+            headless: bool = False,
+            render_cache: RenderCache | None = None,
+            dirty_rects: bool = True):
+        """
+        :param log_data: Stream the telemetry of every step into the file log_filename, see TelemetryReader
+        :param headless: Render into an offscreen surface instead of a window, works without any display
+        :param render_cache: Cache of rotated surfaces, texts and polygons, may be shared between visualizations
+        :param dirty_rects: Only clear and update the areas which got drawn in the last and the current frame instead
+        of the whole screen
+        """
         self.simulation = simulation
         self.fps = fps
         self.angle = initial_angle
@@ -44,9 +56,12 @@ class Visualization(ABC):
         self.num_marker_positions = 9
         self.log_data = log_data
         self.log_filename = log_filename
-        self.positions = []
-        self.angles = []
-        self.velocities = []
+        self.headless = headless
+        self.render_cache = render_cache or RenderCache()
+        self.use_dirty_rects = dirty_rects
+        self.dirty_rects = []
+        self.previous_rects = None
+        self.telemetry_logger = None
 
         self.screen = None
         self.clock = None
@@ -61,17 +76,56 @@ class Visualization(ABC):
         self.marker_surface = None
         self.marker_rect = None
 
+        if log_data:
+            self.telemetry_logger = TelemetryLogger(log_filename)
         self.initialize_pygame()
         self.create_seesaw()
         self.create_ball()
         self.create_marker()
 
     def initialize_pygame(self):
+        if self.headless:
+            # The dummy driver lets pygame initialize on machines without a display
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
         py.init()
-        self.screen = py.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+        if self.headless:
+            self.screen = py.Surface((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+        else:
+            self.screen = py.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+            py.display.set_caption('Simulation')
         self.clock = py.time.Clock()
-        self.font = pygame.font.SysFont('arial.ttf', 30)
-        py.display.set_caption('Simulation')
+        self.font = self.render_cache.font('arial.ttf', 30)
+
+    def begin_frame(self):
+        """
+        Clears the screen, with dirty rects only where the last frame drew something
+        """
+        if self.use_dirty_rects and self.previous_rects is not None:
+            for rect in self.previous_rects:
+                self.screen.fill(self.WHITE, rect)
+        else:
+            self.screen.fill(self.WHITE)
+
+    def present(self):
+        """
+        Shows the rendered frame, offscreen surfaces only get drawn into
+        """
+        if not self.headless:
+            if self.use_dirty_rects and self.previous_rects is not None:
+                py.display.update(self.previous_rects + self.dirty_rects)
+            else:
+                py.display.flip()
+        self.previous_rects = self.dirty_rects
+        self.dirty_rects = []
+
+    def blit(self, surface: py.Surface, destination) -> py.Rect:
+        rect = self.screen.blit(surface, destination)
+        self.dirty_rects.append(rect)
+
+        return rect
+
+    def render_text(self, text: str, position: tuple, color: tuple = BLACK):
+        self.blit(self.render_cache.text(self.font, text, color), position)
 
     def create_seesaw(self):
         self.seesaw_surface = py.Surface((self.SEESAW_LENGTH, self.SEESAW_THICKNESS))
@@ -95,12 +149,12 @@ class Visualization(ABC):
 
     def render_seesaw(self):
         temp_center = self.seesaw_rect.center
-        new_seesaw_surface = py.transform.rotate(self.seesaw_surface, self.angle)
+        new_seesaw_surface = self.render_cache.rotated(self.seesaw_surface, self.angle, 'seesaw')
 
         new_seesaw_rect = new_seesaw_surface.get_rect()
         new_seesaw_rect.center = temp_center
 
-        self.screen.blit(new_seesaw_surface, new_seesaw_rect)
+        self.blit(new_seesaw_surface, new_seesaw_rect)
 
     def render_ball(self, ball_position_x: float):
         ball_x = self.SCREEN_WIDTH // 2 + ball_position_x - (self.BALL_RADIUS + self.SEESAW_THICKNESS / 2) * sin(
@@ -110,7 +164,7 @@ class Visualization(ABC):
 
         ball_rect = self.ball_surface.get_rect(center=(ball_x, ball_y))
 
-        self.screen.blit(self.ball_surface, ball_rect)
+        self.blit(self.ball_surface, ball_rect)
 
     def render_marker(self, position: int):
         marker_distance = self.SEESAW_LENGTH / (self.num_marker_positions - 1)
@@ -119,12 +173,12 @@ class Visualization(ABC):
         marker_x = marker_position_relative_to_seesaw_center * cos(radians(self.angle)) + self.SCREEN_WIDTH // 2
         marker_y = self.SCREEN_HEIGHT // 2 - (marker_x - self.SCREEN_WIDTH // 2) * tan(radians(self.angle))
 
-        new_marker_surface = py.transform.rotate(self.marker_surface, self.angle)
+        new_marker_surface = self.render_cache.rotated(self.marker_surface, self.angle, 'marker')
 
         new_marker_rect = new_marker_surface.get_rect()
         new_marker_rect.center = (marker_x, marker_y)
 
-        self.screen.blit(new_marker_surface, new_marker_rect)
+        self.blit(new_marker_surface, new_marker_rect)
 
     def render_external_force_arrow(self, external_force: float):
         max_arrow_height = 120
@@ -140,32 +194,17 @@ class Visualization(ABC):
             return
 
         arrow_y = (self.SCREEN_HEIGHT - arrow_height) // 2
-        if external_force > 0:
-            pygame.draw.polygon(self.screen, self.BLACK, ((arrow_x, arrow_y + arrow_height * 0.33),
-                                                          (arrow_x, arrow_y + arrow_height * 0.66),
-                                                          (arrow_x + arrow_height * 0.6,
-                                                           arrow_y + arrow_height * 0.66),
-                                                          (arrow_x + arrow_height * 0.6,
-                                                           arrow_y + arrow_height),
-                                                          (arrow_x + arrow_height * 1.2,
-                                                           arrow_y + arrow_height * 0.5),
-                                                          (arrow_x + arrow_height * 0.6,
-                                                           arrow_y),
-                                                          (arrow_x + arrow_height * 0.6,
-                                                           arrow_y + arrow_height * 0.33)))
-        elif external_force < 0:
-            pygame.draw.polygon(self.screen, self.BLACK, ((arrow_x, arrow_y + arrow_height * 0.33),
-                                                          (arrow_x, arrow_y + arrow_height * 0.66),
-                                                          (arrow_x - arrow_height * 0.6,
-                                                           arrow_y + arrow_height * 0.66),
-                                                          (arrow_x - arrow_height * 0.6,
-                                                           arrow_y + arrow_height),
-                                                          (arrow_x - arrow_height * 1.2,
-                                                           arrow_y + arrow_height * 0.5),
-                                                          (arrow_x - arrow_height * 0.6,
-                                                           arrow_y),
-                                                          (arrow_x - arrow_height * 0.6,
-                                                           arrow_y + arrow_height * 0.33)))
+        direction = 1 if external_force > 0 else -1
+        arrow = self.render_cache.polygon(('external_force_arrow', direction, arrow_height), lambda: [
+            (arrow_x, arrow_y + arrow_height * 0.33),
+            (arrow_x, arrow_y + arrow_height * 0.66),
+            (arrow_x + direction * arrow_height * 0.6, arrow_y + arrow_height * 0.66),
+            (arrow_x + direction * arrow_height * 0.6, arrow_y + arrow_height),
+            (arrow_x + direction * arrow_height * 1.2, arrow_y + arrow_height * 0.5),
+            (arrow_x + direction * arrow_height * 0.6, arrow_y),
+            (arrow_x + direction * arrow_height * 0.6, arrow_y + arrow_height * 0.33)
+        ])
+        self.dirty_rects.append(pygame.draw.polygon(self.screen, self.BLACK, arrow))
 
     def render_data(self, angle: float, velocity: float, position: float, external_force: float):
         # Prevent annoying fluctuations because of rolling friction coefficient
@@ -173,32 +212,25 @@ class Visualization(ABC):
             velocity = 0
 
         # Render Angle
-        angle_text_surface = self.font.render(f'Angle: {round(angle, 2)}°', True, self.BLACK)
-        self.screen.blit(angle_text_surface, (10, 10))
+        self.render_text(f'Angle: {round(angle, 2)}°', (10, 10))
         # Render Velocity
-        angle_text_surface = self.font.render(f'Velocity: {round(velocity, 2)} m/s', True, self.BLACK)
-        self.screen.blit(angle_text_surface, (10, 40))
+        self.render_text(f'Velocity: {round(velocity, 2)} m/s', (10, 40))
         # Render Position
-        angle_text_surface = self.font.render(f'Position: {round(position, 2)} m', True, self.BLACK)
-        self.screen.blit(angle_text_surface, (10, 70))
+        self.render_text(f'Position: {round(position, 2)} m', (10, 70))
         # Render External Force
-        external_force_text_surface = self.font.render(f'External Force: {round(external_force, 2)} N', True,
-                                                       self.BLACK)
-        self.screen.blit(external_force_text_surface, (10, 100))
+        self.render_text(f'External Force: {round(external_force, 2)} N', (10, 100))
 
-    def log(self, angle, velocity, position):
-        if self.log_data:
-            self.angles.append(angle)
-            self.velocities.append(velocity)
-            self.positions.append(position)
+    def log(self, step: int, angle: float, velocity: float, position: float, setpoint: float | None, external_force: float):
+        """
+        :param step: Number of simulated steps so far, the records get timestamped with the simulated time, which differs
+        from the wall-clock time whenever the visualization doesn't run in real time
+        """
+        if self.telemetry_logger is not None:
+            self.telemetry_logger.log(angle, velocity, position, float('nan') if setpoint is None else setpoint, external_force, step * self.simulation.delta_t)
 
     def save_log(self):
-        if self.log_data:
-            pd.DataFrame({
-                'angle': self.angles,
-                'velocity': self.velocities,
-                'position': self.positions
-            }).to_csv(self.log_filename, index=False)
+        if self.telemetry_logger is not None:
+            self.telemetry_logger.close()
 
     @abstractmethod
     def run(self):
@@ -2,13 +2,19 @@ from src.visualization.visualizationtype import VisualizationType
 from src.visualization.visualization import Visualization
 from src.visualization.keyboardvisualization import KeyboardVisualization
 from src.visualization.pidvisualization import PIDVisualization
-from src.simulation import Simulation
+from src.visualization.replayvisualization import ReplayVisualization
+from src.simulation import Simulation, Scenario
 from src.pid import PIDController
 
 
 class VisualizationFactory:
     @staticmethod
-    def create_visualization(visualization_type: VisualizationType, log_data=False, kp=0, ki=0, kd=0) -> Visualization:
+    def create_visualization(visualization_type: VisualizationType, log_data=False, kp=0, ki=0, kd=0, scenario: Scenario | None = None, headless=True, frame_skip=1, output_directory: str | None = None) -> Visualization:
+        """
+        :param headless: Only used by the replay, which renders offscreen unless disabled
+        :param frame_skip: Only used by the replay, only every frame_skip-th step gets rendered
+        :param output_directory: Only used by the replay, directory the frames get exported to
+        """
         # Simulation Parameters
         fps = 30
         mass = 0.2
@@ -33,7 +39,7 @@ class VisualizationFactory:
         )
 
         # PID-Controller Parameters
-        setpoint = 0
+        setpoint = scenario.initial_setpoint if scenario is not None else 0
         # Create PID-Controller
         pid_controller = PIDController(kp, ki, kd, setpoint)
 
@@ -57,7 +63,21 @@ class VisualizationFactory:
                 initial_position,
                 initial_external_force,
                 max_external_force,
-                log_data
+                log_data,
+                scenario=scenario
+            )
+        elif visualization_type == VisualizationType.REPLAY:
+            if scenario is None:
+                raise ValueError('The replay needs a Scenario')
+            return ReplayVisualization.from_controller(
+                pid_controller,
+                simulation,
+                scenario,
+                fps,
+                frame_skip=frame_skip,
+                output_directory=output_directory,
+                headless=headless,
+                log_data=log_data
             )
         else:
             raise NotImplementedError('Specified Visualization Type not implemented')
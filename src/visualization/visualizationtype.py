@@ -4,3 +4,4 @@ from enum import Enum
 class VisualizationType(Enum):
     KEYBOARD = 1
     PID = 2
+    REPLAY = 3
@@ -0,0 +1,38 @@
+import numpy as np
+
+from src.evaluation import Evaluator
+from src.optimization.surrogateoptimizer import SurrogateOptimizer
+
+
+class DivergingEvaluator(Evaluator):
+    """
+    Evaluator whose runs all diverge
+    """
+    def __init__(self, error: float):
+        super().__init__(1.0, 0.05, [0.0], [0.0], 1.0)
+        self.error = error
+
+    def evaluate(self, gains: np.ndarray) -> np.ndarray:
+        return np.full(len(np.asarray(gains).reshape(-1, 3)), self.error)
+
+
+def test_best_without_finite_error_returns_first_observation():
+    for error in (np.nan, np.inf):
+        optimizer = SurrogateOptimizer(DivergingEvaluator(error), [(0, 10), (0, 1), (0, 5)], num_initial=4, seed=0)
+        optimizer.observe(optimizer.latin_hypercube(4))
+
+        gains, best_error = optimizer.best()
+
+        np.testing.assert_allclose(gains, optimizer.to_gains(optimizer.x[0]))
+        assert best_error == np.inf
+
+
+def test_best_prefers_finite_error():
+    optimizer = SurrogateOptimizer(DivergingEvaluator(np.nan), [(0, 10), (0, 1), (0, 5)], seed=0)
+    optimizer.x = np.array([[0.1, 0.1, 0.1], [0.5, 0.5, 0.5], [0.9, 0.9, 0.9]])
+    optimizer.errors = np.array([np.nan, 3.0, np.inf])
+
+    gains, best_error = optimizer.best()
+
+    np.testing.assert_allclose(gains, optimizer.to_gains(optimizer.x[1]))
+    assert best_error == 3.0